@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import struct
+import time
+
+import sa11y
+from sa11y.analyze import Analyze, iframe_allowed_script
+
+# Whether this document already holds the given axe build, plus the frames to descend into
+axe_state_script = """var loaded = typeof window.axe !== 'undefined' &&
+window.__sauceAxe === arguments[0];
+return [loaded, Array.prototype.slice.call(document.querySelectorAll('frame, iframe'))];"""
+
+axe_marker_script = "window.__sauceAxe = arguments[0];"
+
+# Result groups not listed in arguments[2] are dropped in the browser before serialization
+axe_scoped_run_script = """var callback = arguments[arguments.length - 1];
+var context = arguments[0] || document; var options = arguments[1] || {}; var keep = arguments[2];
+axe.run(context, options, function (err, results) {
+  if (err) { throw new Error(err); }
+  if (keep) {
+    ['violations', 'incomplete', 'passes', 'inapplicable'].forEach(function (type) {
+      if (keep.indexOf(type) === -1) { delete results[type]; }
+    });
+  }
+  callback(results);
+});"""
+
+# cyrb53 over rule id, target and url; fingerprint() below must stay in step with it
+axe_fingerprint_function = """function fingerprint(ruleId, target, url) {
+  var text = ruleId + '\\n' + JSON.stringify(target) + '\\n' + url;
+  var h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+  for (var i = 0, ch; i < text.length; i++) {
+    ch = text.charCodeAt(i);
+    h1 = Math.imul(h1 ^ ch, 2654435761);
+    h2 = Math.imul(h2 ^ ch, 1597334677);
+  }
+  h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507);
+  h1 ^= Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+  h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507);
+  h2 ^= Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+  var hash = (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(16);
+  return '00000000000000'.slice(hash.length) + hash;
+}"""
+
+# Reduces violations to counts and fingerprints so node details never leave the browser
+axe_summary_run_script = axe_fingerprint_function + """
+var callback = arguments[arguments.length - 1];
+var context = arguments[0] || document; var options = arguments[1] || {};
+options.resultTypes = ['violations'];
+axe.run(context, options, function (err, results) {
+  if (err) { throw new Error(err); }
+  var summary = {url: results.url, violations: 0, rules: {}, impacts: {}, fingerprints: []};
+  results.violations.forEach(function (rule) {
+    rule.nodes.forEach(function (node) {
+      var impact = node.impact || rule.impact || 'unknown';
+      summary.violations += 1;
+      summary.rules[rule.id] = (summary.rules[rule.id] || 0) + 1;
+      summary.impacts[impact] = (summary.impacts[impact] || 0) + 1;
+      summary.fingerprints.push(fingerprint(rule.id, node.target, results.url));
+    });
+  });
+  summary.fingerprints.sort();
+  callback(summary);
+});"""
+
+axe_result_types = ('violations', 'incomplete', 'passes', 'inapplicable')
+
+_js_libs = {}
+_digests = {}
+
+
+def default_js_lib():
+    path = os.path.join(os.path.dirname(sa11y.__file__), "scripts/axe.min.js")
+    if path not in _js_libs:
+        with open(path, "r") as f:
+            _js_libs[path] = f.read()
+    return _js_libs[path]
+
+
+def js_lib_digest(js_lib):
+    if js_lib not in _digests:
+        _digests[js_lib] = hashlib.sha1(js_lib.encode('utf-8')).hexdigest()
+    return _digests[js_lib]
+
+
+class AccessibilityMetrics(object):
+
+    def __init__(self):
+        self.bytes_sent = 0
+        self.injections = 0
+        self.reused = 0
+        self.duration = 0.0
+
+    @property
+    def frames(self):
+        return self.injections + self.reused
+
+    def __repr__(self):
+        return "AccessibilityMetrics(bytes_sent={}, injections={}, reused={}, duration={:.3f})" \
+            .format(self.bytes_sent, self.injections, self.reused, self.duration)
+
+
+def _imul(a, b):
+    return (a * b) & 0xFFFFFFFF
+
+
+def fingerprint(rule_id, target, url=''):
+    target = json.dumps(target, separators=(',', ':'), ensure_ascii=False)
+    text = "{}\n{}\n{}".format(rule_id, target, url)
+    data = text.encode('utf-16-le')
+    h1, h2 = 0xdeadbeef, 0x41c6ce57
+    for ch in struct.unpack('<{}H'.format(len(data) // 2), data):
+        h1 = _imul(h1 ^ ch, 2654435761)
+        h2 = _imul(h2 ^ ch, 1597334677)
+    h1 = _imul(h1 ^ (h1 >> 16), 2246822507) ^ _imul(h2 ^ (h2 >> 13), 3266489909)
+    h2 = _imul(h2 ^ (h2 >> 16), 2246822507) ^ _imul(h1 ^ (h1 >> 13), 3266489909)
+    return '{:014x}'.format(4294967296 * (2097151 & h2) + h1)
+
+
+def _selectors(selectors):
+    if selectors is None:
+        return None
+    if isinstance(selectors, str):
+        selectors = [selectors]
+    return [[selector] if isinstance(selector, str) else list(selector) for selector in selectors]
+
+
+class CachedAnalyze(Analyze):
+
+    def __init__(self, driver, js_lib=None, frames=True, cross_origin=False, include=None,
+                 exclude=None, tags=None, result_types=None):
+        self.driver = driver
+        self._js_lib = js_lib or default_js_lib()
+        self._frames = frames
+        self._cross_origin = cross_origin
+        self.include = include
+        self.exclude = exclude
+        self.tags = tags
+        self.result_types = result_types
+        self.metrics = AccessibilityMetrics()
+
+    @property
+    def result_types(self):
+        return self._result_types
+
+    @result_types.setter
+    def result_types(self, types):
+        if types is not None:
+            types = [types] if isinstance(types, str) else list(types)
+            invalid = [t for t in types if t not in axe_result_types]
+            if invalid:
+                raise ValueError("Invalid result types {}, please select from: {}".format(
+                    invalid, list(axe_result_types)))
+        self._result_types = types
+
+    def context(self):
+        if self.include is None and self.exclude is None:
+            return None
+        context = {}
+        if self.include is not None:
+            context['include'] = _selectors(self.include)
+        if self.exclude is not None:
+            context['exclude'] = _selectors(self.exclude)
+        return context
+
+    def run_options(self):
+        options = {}
+        if self.tags:
+            tags = [self.tags] if isinstance(self.tags, str) else list(self.tags)
+            options['runOnly'] = {'type': 'tag', 'values': tags}
+        if self._result_types is not None:
+            options['resultTypes'] = self._result_types
+        return options
+
+    def results(self):
+        return self._run(axe_scoped_run_script, self.context(), self.run_options(),
+                         self._result_types)
+
+    def summary(self):
+        return self._run(axe_summary_run_script, self.context(), self.run_options())
+
+    def _run(self, script, *args):
+        start = time.perf_counter()
+        if self._frames:
+            self.driver.switch_to.default_content()
+            self.manage_frames()
+        else:
+            self.inject()
+
+        results = self.driver.execute_async_script(script, *args)
+        self.metrics.duration = time.perf_counter() - start
+        return results
+
+    def inject(self):
+        digest = js_lib_digest(self._js_lib)
+        loaded, frames = self.driver.execute_script(axe_state_script, digest)
+        if loaded:
+            self.metrics.reused += 1
+        else:
+            self.driver.execute_script(self._js_lib)
+            self.driver.execute_script(axe_marker_script, digest)
+            self.metrics.injections += 1
+            self.metrics.bytes_sent += len(self._js_lib.encode('utf-8'))
+        if self._cross_origin:
+            self.driver.execute_script(iframe_allowed_script)
+        return frames
+
+    def manage_frames(self):
+        for frame in self.inject():
+            self.driver.switch_to.frame(frame)
+            self.manage_frames()
+            self.driver.switch_to.parent_frame()
@@ -0,0 +1,54 @@
+import base64
+import json
+from urllib.request import Request, urlopen
+
+data_centers = {
+    'us-west': 'ondemand.us-west-1.saucelabs.com',
+    'us-east': 'ondemand.us-east-1.saucelabs.com',
+    'eu-central': 'ondemand.eu-central-1.saucelabs.com',
+    'apac-southeast': 'ondemand.apac-southeast-1.saucelabs.com'
+}
+
+
+class SauceApi(object):
+
+    def __init__(self, username, access_key, data_center='us-west', url=None, timeout=30):
+        if data_center.lower() not in data_centers.keys():
+            raise ValueError("Invalid Data Center value, please select from:",
+                             list(data_centers.keys()))
+        self.username = username
+        self.access_key = access_key
+        self.data_center = data_center
+        self.url = url or 'https://{}'.format(data_centers[data_center].replace("ondemand", "api"))
+        self.timeout = timeout
+        credentials = '{}:{}'.format(username, access_key).encode('utf-8')
+        self._authorization = 'Basic {}'.format(base64.b64encode(credentials).decode('ascii'))
+
+    @classmethod
+    def from_options(cls, options, data_center='us-west', **kwargs):
+        sauce_options = options.options['sauce:options']
+        return cls(sauce_options['username'], sauce_options['accessKey'], data_center, **kwargs)
+
+    def job_path(self, session_id):
+        return '/rest/v1/{}/jobs/{}'.format(self.username, session_id)
+
+    def open(self, method, path, body=None, headers=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        request = Request(self.url + path, data=data, method=method)
+        request.add_header('Authorization', self._authorization)
+        if data is not None:
+            request.add_header('Content-Type', 'application/json')
+        for key, value in (headers or {}).items():
+            request.add_header(key, value)
+        return urlopen(request, timeout=self.timeout)
+
+    def request(self, method, path, body=None):
+        with self.open(method, path, body) as response:
+            content = response.read()
+        return json.loads(content.decode('utf-8')) if content else None
+
+    def update_job(self, session_id, **fields):
+        return self.request('PUT', self.job_path(session_id), fields)
+
+    def stop_job(self, session_id):
+        return self.request('PUT', self.job_path(session_id) + '/stop')
@@ -0,0 +1,99 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+
+from .api import SauceApi
+
+
+class ArtifactFetcher(object):
+
+    def __init__(self, api, directory, max_workers=8, include=None, chunk_size=64 * 1024):
+        self.api = api
+        self.directory = directory
+        self.max_workers = max_workers
+        self.include = include
+        self.chunk_size = chunk_size
+        self.downloaded = 0
+        self.skipped = 0
+        self.failures = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_options(cls, options, directory, data_center='us-west', **kwargs):
+        return cls(SauceApi.from_options(options, data_center), directory, **kwargs)
+
+    def assets(self, session_id):
+        listing = self.api.request('GET', self.api.job_path(session_id) + '/assets')
+        names = []
+        for value in (listing or {}).values():
+            for name in (value if isinstance(value, list) else [value]):
+                if isinstance(name, str) and name not in names:
+                    names.append(name)
+        if self.include is not None:
+            names = [name for name in names if name in self.include]
+        return names
+
+    def fetch(self, sessions):
+        session_ids = [getattr(session, 'session_id', session) for session in sessions]
+        session_ids = [session_id for session_id in session_ids if session_id]
+        if not session_ids:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            listings = dict(zip(session_ids, executor.map(self._assets, session_ids)))
+            jobs = [(session_id, name) for session_id in session_ids
+                    for name in listings[session_id]]
+            paths = list(executor.map(self._download, jobs))
+
+        downloaded = {session_id: [] for session_id in session_ids}
+        for (session_id, _), path in zip(jobs, paths):
+            if path is not None:
+                downloaded[session_id].append(path)
+        return downloaded
+
+    def download(self, session_id, name):
+        path = os.path.join(self.directory, session_id, os.path.basename(name))
+        if os.path.exists(path):
+            with self._lock:
+                self.skipped += 1
+            return path
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = path + '.part'
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        headers = {'Range': 'bytes={}-'.format(offset)} if offset else None
+        try:
+            response = self.api.open('GET', self.api.job_path(session_id) + '/assets/' + name,
+                                     headers=headers)
+        except HTTPError as e:
+            if e.code != 416:
+                raise
+            # The partial file already holds the whole asset
+            e.close()
+        else:
+            with response:
+                mode = 'ab' if response.status == 206 else 'wb'
+                with open(partial, mode) as f:
+                    for chunk in iter(lambda: response.read(self.chunk_size), b''):
+                        f.write(chunk)
+        os.replace(partial, path)
+        with self._lock:
+            self.downloaded += 1
+        return path
+
+    def _assets(self, session_id):
+        try:
+            return self.assets(session_id)
+        except Exception as e:
+            with self._lock:
+                self.failures.append((session_id, None, e))
+            return []
+
+    def _download(self, job):
+        session_id, name = job
+        try:
+            return self.download(session_id, name)
+        except Exception as e:
+            with self._lock:
+                self.failures.append((session_id, name, e))
@@ -0,0 +1,77 @@
+import threading
+import time
+
+
+class CommandListener(object):
+
+    def before_command(self, command, params):
+        pass
+
+    def after_command(self, command, params, response, duration):
+        pass
+
+    def on_error(self, command, params, error, duration):
+        pass
+
+
+class CommandMonitor(object):
+
+    def __init__(self, driver):
+        self.listeners = []
+        self.in_flight = 0
+        self.last_activity = time.monotonic()
+        self.cache = None
+        self._lock = threading.Lock()
+        self._execute = driver.execute
+        driver.execute = self.execute
+
+    @property
+    def idle_time(self):
+        with self._lock:
+            if self.in_flight:
+                return 0.0
+            return time.monotonic() - self.last_activity
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+        return listener
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def execute(self, command, params=None):
+        cache = self.cache
+        if cache is not None:
+            response = cache.lookup(command, params)
+            if response is not None:
+                return response
+        with self._lock:
+            self.in_flight += 1
+        for listener in list(self.listeners):
+            listener.before_command(command, params)
+        start = time.monotonic()
+        try:
+            response = self._execute(command, params)
+        except Exception as e:
+            duration = time.monotonic() - start
+            for listener in list(self.listeners):
+                listener.on_error(command, params, e, duration)
+            raise
+        else:
+            duration = time.monotonic() - start
+            for listener in list(self.listeners):
+                listener.after_command(command, params, response, duration)
+            return response
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.last_activity = time.monotonic()
+
+
+def monitor(driver):
+    # Kept on the driver itself, since the monitor holds the driver's bound execute
+    command_monitor = vars(driver).get('_sauce_monitor')
+    if command_monitor is None:
+        command_monitor = driver._sauce_monitor = CommandMonitor(driver)
+    return command_monitor
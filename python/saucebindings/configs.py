@@ -1,3 +1,81 @@
+import re
+
+
+def _string(value):
+    if not isinstance(value, str):
+        return "must be a string"
+
+
+def _boolean(value):
+    if not isinstance(value, bool):
+        return "must be true or false"
+
+
+def _mapping(value):
+    if not isinstance(value, dict):
+        return "must be an object"
+
+
+def _one_of(*allowed):
+    allowed = frozenset(allowed)
+    message = "must be one of {}".format(', '.join(sorted(allowed)))
+
+    def check(value):
+        if value not in allowed:
+            return message
+    return check
+
+
+def _integer(minimum=None, maximum=None):
+    message = "must be an integer"
+    if minimum is not None and maximum is not None:
+        message = "must be an integer from {} to {}".format(minimum, maximum)
+    elif minimum is not None:
+        message = "must be an integer of at least {}".format(minimum)
+
+    def check(value):
+        if not isinstance(value, int) or isinstance(value, bool) or \
+                (minimum is not None and value < minimum) or \
+                (maximum is not None and value > maximum):
+            return message
+    return check
+
+
+def _matches(pattern, description):
+    match = re.compile(pattern).match
+    message = "must be {}".format(description)
+
+    def check(value):
+        if not isinstance(value, str) or match(value) is None:
+            return message
+    return check
+
+
+def _strings(value):
+    if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+        return "must be a list of strings"
+
+
+def _proxy(value):
+    if not isinstance(value, dict) and not hasattr(value, 'to_capabilities'):
+        return "must be an object or a selenium Proxy"
+
+
+def _prerun(value):
+    if not isinstance(value, (str, dict)):
+        return "must be a URL or an object"
+
+
+_timeout_keys = frozenset(['implicit', 'pageLoad', 'script'])
+
+
+def _timeouts(value):
+    if not isinstance(value, dict) or not _timeout_keys.issuperset(value) or \
+            not all(isinstance(item, int) and not isinstance(item, bool) and item >= 0
+                    for item in value.values()):
+        return "must be an object of non-negative integer implicit, pageLoad and script values"
+
+
 class Configs:
     base_configs = {
         'platform_name': 'platformName',
@@ -65,6 +143,52 @@ class Configs:
         'set_window_rect': 'setWindowRect'
     }
 
+    # Value checks per camelCase key; each returns an error message or None
+    value_validators = {
+        'browserName': _string,
+        'browserVersion': _string,
+        'platformName': _string,
+        'pageLoadStrategy': _one_of('normal', 'eager', 'none'),
+        'acceptInsecureCerts': _boolean,
+        'proxy': _proxy,
+        'setWindowRect': _boolean,
+        'strictFileInteractability': _boolean,
+        'timeouts': _timeouts,
+        'unhandledPromptBehavior': _one_of('dismiss', 'accept', 'dismiss and notify',
+                                           'accept and notify', 'ignore'),
+        'avoidProxy': _boolean,
+        'build': _string,
+        'capturePerformance': _boolean,
+        'chromedriverVersion': _string,
+        'commandTimeout': _integer(1, 600),
+        'customData': _mapping,
+        'edgedriverVersion': _string,
+        'extendedDebugging': _boolean,
+        'geckodriverVersion': _string,
+        'idleTimeout': _integer(1, 1000),
+        'iedriverVersion': _string,
+        'maxDuration': _integer(1, 10800),
+        'name': _string,
+        'parentTunnel': _string,
+        'prerun': _prerun,
+        'priority': _integer(0),
+        'public': _one_of('public', 'public restricted', 'share', 'team', 'private'),
+        'recordLogs': _boolean,
+        'recordScreenshots': _boolean,
+        'recordVideo': _boolean,
+        'screenResolution': _matches(r'^[1-9][0-9]*x[1-9][0-9]*$', 'in the form WIDTHxHEIGHT'),
+        'seleniumVersion': _string,
+        'tags': _strings,
+        'timeZone': _string,
+        'tunnelIdentifier': _string,
+        'tunnelOwner': _string,
+        'videoUploadOnPass': _boolean
+    }
+
+    def validators(self, configs):
+        keys = ['browserName'] + list(configs.values())
+        return {key: self.value_validators[key] for key in keys if key in self.value_validators}
+
     def vdcConfigs(self):
         return {**(self).base_configs, **self.vdc_configs}
 
@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from urllib.request import urlopen
+from xml.etree import ElementTree
+
+from selenium.common.exceptions import InvalidSessionIdException
+
+from .api import data_centers
+from .network import connections
+from .registry import registry
+from .session import SauceSession
+
+sitemap_namespace = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+def sitemap_urls(source):
+    stream = urlopen(source) if source.startswith(('http://', 'https://')) else open(source, 'rb')
+    with stream:
+        for _, element in ElementTree.iterparse(stream):
+            if element.tag in (sitemap_namespace + 'loc', 'loc'):
+                yield element.text.strip()
+            element.clear()
+
+
+class CrawlStats(object):
+
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.finished = None
+
+    @property
+    def pages(self):
+        return self.completed + self.failed
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def pages_per_minute(self):
+        return self.pages / self.elapsed * 60 if self.elapsed else 0.0
+
+    def __repr__(self):
+        return "CrawlStats(completed={}, failed={}, elapsed={:.1f}, pages_per_minute={:.1f})" \
+            .format(self.completed, self.failed, self.elapsed, self.pages_per_minute)
+
+
+class AccessibilityCrawler(object):
+
+    def __init__(self, options=None, data_center='us-west', sessions=4, page_timeout=30,
+                 sink=None, progress=None, summary=False, warm_up=True, **scan_options):
+        if summary and hasattr(sink, 'add'):
+            # Summaries only carry violation counts, not the rule nodes a store fingerprints
+            raise ValueError("Summary results cannot be added to a store, use full results "
+                             "or a callable sink")
+        self.options = options
+        self.data_center = data_center
+        self.sessions = sessions
+        self.page_timeout = page_timeout
+        self.sink = sink
+        self.progress = progress
+        self.summary = summary
+        self.scan_options = scan_options
+        self._lock = threading.Lock()
+        if warm_up:
+            connections.warm_up('https://{}/wd/hub'.format(data_centers[data_center]), sessions)
+
+    def crawl(self, urls):
+        if isinstance(urls, str):
+            urls = sitemap_urls(urls)
+
+        stats = CrawlStats()
+        pages = queue.Queue(maxsize=self.sessions * 2)
+        workers = [threading.Thread(target=self._work, args=(pages, stats), daemon=True)
+                   for _ in range(self.sessions)]
+        for worker in workers:
+            worker.start()
+        for url in urls:
+            if not self._put(pages, url, workers):
+                raise RuntimeError("Crawl workers exited before all pages were scanned")
+        for _ in workers:
+            if not self._put(pages, None, workers):
+                break
+        for worker in workers:
+            worker.join()
+
+        stats.finished = time.perf_counter()
+        return stats
+
+    @staticmethod
+    def _put(pages, item, workers):
+        # A bounded queue blocks forever once every consumer is gone
+        while any(worker.is_alive() for worker in workers):
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _work(self, pages, stats):
+        session = None
+        try:
+            for url in iter(pages.get, None):
+                try:
+                    if session is None:
+                        session = self._start_session()
+                    results = self._scan(session, url)
+                except Exception as e:
+                    self._record(stats, url, error=e)
+                    if isinstance(e, InvalidSessionIdException):
+                        # The remote job is gone; only its local registration is left to release
+                        registry.unregister(session)
+                        session = None
+                else:
+                    self._record(stats, url, results=results)
+        finally:
+            if session is not None and session.driver is not None:
+                session.stop(True)
+
+    def _start_session(self):
+        session = SauceSession(self.options, data_center=self.data_center)
+        driver = session.start()
+        driver.set_page_load_timeout(self.page_timeout)
+        driver.set_script_timeout(self.page_timeout)
+        return session
+
+    def _scan(self, session, url):
+        session.driver.get(url)
+        if self.summary:
+            return session.accessibility_summary(**self.scan_options)
+        return session.accessibility_results(**self.scan_options)
+
+    def _record(self, stats, url, results=None, error=None):
+        with self._lock:
+            if error is None:
+                try:
+                    if hasattr(self.sink, 'add'):
+                        self.sink.add(results)
+                    elif self.sink is not None:
+                        self.sink(url, results)
+                except Exception as e:
+                    error = e
+            if error is None:
+                stats.completed += 1
+            else:
+                stats.failed += 1
+                stats.errors.append((url, error))
+            if self.progress is not None:
+                self.progress(stats)
@@ -0,0 +1,125 @@
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.webdriver.common.by import By
+
+element_properties = ('element', 'text', 'displayed', 'enabled', 'selected', 'tag_name', 'rect')
+property_prefixes = ('attribute:', 'property:', 'css:')
+
+# Shared by the scripts below: finds the nodes for a translated locator
+find_function = """function find(query) {
+  var root = query.parent || document;
+  if (query.using === 'xpath') {
+    var snapshot = document.evaluate(query.value, root, null,
+                                     XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+    return nodes;
+  }
+  if (query.using === 'link text' || query.using === 'partial link text') {
+    return Array.prototype.filter.call(root.querySelectorAll('a'), function (a) {
+      var text = a.innerText.trim();
+      return query.using === 'link text' ? text === query.value : text.indexOf(query.value) !== -1;
+    });
+  }
+  return Array.prototype.slice.call(root.querySelectorAll(query.value));
+}"""
+
+# Approximates WebDriver's element displayedness without a round trip per element
+displayed_function = """function displayed(el) {
+  var style = window.getComputedStyle(el);
+  return style.visibility !== 'hidden' && style.display !== 'none' &&
+         parseFloat(style.opacity) !== 0 && el.getClientRects().length > 0;
+}"""
+
+# Locates every query and reads the requested properties in one call; elements come back as
+# references the driver turns into WebElements
+bulk_query_script = find_function + displayed_function + """
+function read(el, name) {
+  switch (name) {
+    case 'element': return el;
+    case 'text': return el.innerText === undefined ? el.textContent : el.innerText;
+    case 'displayed': return displayed(el);
+    case 'enabled': return !el.disabled;
+    case 'selected': return !!(el.checked || el.selected);
+    case 'tag_name': return el.tagName.toLowerCase();
+    case 'rect':
+      var r = el.getBoundingClientRect();
+      return {x: r.left + window.pageXOffset, y: r.top + window.pageYOffset,
+              width: r.width, height: r.height};
+  }
+  var split = name.indexOf(':'); var kind = name.slice(0, split); var key = name.slice(split + 1);
+  if (kind === 'attribute') { return el.getAttribute(key); }
+  if (kind === 'property') { var value = el[key]; return value === undefined ? null : value; }
+  return window.getComputedStyle(el).getPropertyValue(key);
+}
+return arguments[0].map(function (query) {
+  try {
+    var nodes = find(query);
+    if (!query.all) { nodes = nodes.slice(0, 1); }
+    var found = nodes.map(function (el) {
+      var result = {};
+      query.properties.forEach(function (name) { result[name] = read(el, name); });
+      return result;
+    });
+    return {found: found};
+  } catch (e) {
+    return {error: String(e && e.message || e)};
+  }
+});"""
+
+
+def _css_string(value):
+    return '"{}"'.format(value.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def _locator(by, value):
+    if by == By.ID:
+        return 'css selector', '[id={}]'.format(_css_string(value))
+    if by == By.NAME:
+        return 'css selector', '[name={}]'.format(_css_string(value))
+    if by == By.CLASS_NAME:
+        return 'css selector', '.' + '.'.join(value.split())
+    if by in (By.TAG_NAME, By.CSS_SELECTOR):
+        return 'css selector', value
+    if by in (By.XPATH, By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        return by, value
+    raise ValueError("Unsupported locator strategy: {}".format(by))
+
+
+def _validate_properties(properties):
+    for name in properties:
+        if name not in element_properties and not name.startswith(property_prefixes):
+            raise ValueError("Invalid element property {}, please select from: {} or a name "
+                             "prefixed with {}".format(name, list(element_properties),
+                                                       list(property_prefixes)))
+    return list(properties)
+
+
+def _query(locator, properties, all):
+    if isinstance(locator, dict):
+        properties = locator.get('properties', properties)
+        all = locator.get('all', all)
+        parent = locator.get('parent')
+        locator = locator['locator']
+    else:
+        parent = None
+    using, value = _locator(*locator)
+    query = {'using': using, 'value': value, 'all': all,
+             'properties': _validate_properties(properties)}
+    if parent is not None:
+        query['parent'] = parent
+    return query
+
+
+def query_elements(driver, queries, properties=('element', 'text'), all=False):
+    names = list(queries)
+    batch = [_query(queries[name], properties, all) for name in names]
+    responses = driver.execute_script(bulk_query_script, batch)
+
+    results = {}
+    for name, query, response in zip(names, batch, responses):
+        if 'error' in response:
+            raise InvalidSelectorException("Unable to query {} with {} {}: {}".format(
+                name, query['using'], query['value'], response['error']))
+        found = response['found']
+        results[name] = found if query['all'] else (found[0] if found else None)
+    return results
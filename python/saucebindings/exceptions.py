@@ -9,3 +9,36 @@ class InvalidPlatformException(Exception):
     Thrown when a method is called that requires a different Sauce Platform.
     """
     pass
+
+
+class PerformanceBudgetException(AssertionError):
+    """
+    Thrown when page performance metrics exceed their budget or regress from the baseline.
+    """
+
+    def __init__(self, url, regressions):
+        self.url = url
+        self.regressions = regressions
+        details = ', '.join('{} {} > {}'.format(r.metric, r.value, r.limit) for r in regressions)
+        super(PerformanceBudgetException, self).__init__(
+            "Performance budget exceeded for {}: {}".format(url, details))
+
+
+class InvalidOptionsException(AttributeError, ValueError):
+    """
+    Thrown when options, or entries of an options matrix, are not valid for their browser.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        shown = '\n'.join(errors[:20])
+        more = '\n... and {} more'.format(len(errors) - 20) if len(errors) > 20 else ''
+        super(InvalidOptionsException, self).__init__(
+            "{} invalid option(s):\n{}{}".format(len(errors), shown, more))
+
+
+class UnsupportedPlatformException(InvalidPlatformException):
+    """
+    Thrown when a browser, version and platform combination is not available on Sauce Labs.
+    """
+    pass
@@ -0,0 +1,46 @@
+import threading
+
+from selenium.webdriver.remote.command import Command
+
+from .commands import monitor
+from .logger import logger
+
+
+class Heartbeat(object):
+
+    def __init__(self, driver, interval=30):
+        self.driver = driver
+        self.interval = interval
+        self.beats = 0
+        self._monitor = monitor(driver)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if not self.running:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stopped.wait(max(self.interval - self._monitor.idle_time, 0.05)):
+            if self._monitor.in_flight or self._monitor.idle_time < self.interval:
+                continue
+            try:
+                self.driver.execute(Command.GET_CURRENT_URL)
+                self.beats += 1
+            except Exception as e:
+                logger.warning("Heartbeat stopped: %s", e,
+                               extra={'session_id': self.driver.session_id})
+                return
@@ -0,0 +1,96 @@
+import threading
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.command import Command
+
+from .commands import CommandListener, monitor
+
+find_commands = frozenset([Command.FIND_ELEMENT, Command.FIND_ELEMENTS,
+                           Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS])
+
+# Commands that load or switch to another document always clear the cache
+navigation_commands = frozenset([
+    Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH, Command.SWITCH_TO_FRAME,
+    Command.SWITCH_TO_PARENT_FRAME, Command.SWITCH_TO_WINDOW, Command.NEW_WINDOW, Command.CLOSE,
+    Command.QUIT
+])
+
+# Commands that commonly change the DOM; override with invalidate_on
+mutation_commands = frozenset([
+    Command.CLICK_ELEMENT, Command.SEND_KEYS_TO_ELEMENT, Command.CLEAR_ELEMENT,
+    Command.W3C_EXECUTE_SCRIPT, Command.W3C_EXECUTE_SCRIPT_ASYNC, Command.W3C_ACTIONS
+])
+
+
+class LocatorCache(CommandListener):
+
+    def __init__(self, driver, invalidate_on=mutation_commands):
+        self.driver = driver
+        self.invalidate_on = frozenset(invalidate_on) | navigation_commands
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.find_time = 0.0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def saved_time(self):
+        # Estimated from the average duration of the lookups that went to the server
+        return self.hits * self.find_time / self.misses if self.misses else 0.0
+
+    def start(self):
+        commands = monitor(self.driver)
+        commands.add_listener(self)
+        commands.cache = self
+        return self
+
+    def stop(self):
+        commands = monitor(self.driver)
+        commands.remove_listener(self)
+        if commands.cache is self:
+            commands.cache = None
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+
+    def lookup(self, command, params):
+        if command not in find_commands:
+            return None
+        with self._lock:
+            value = self._entries.get(self._key(command, params))
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return {'value': list(value) if isinstance(value, list) else value}
+
+    def after_command(self, command, params, response, duration):
+        if command in find_commands:
+            value = response.get('value') if isinstance(response, dict) else None
+            with self._lock:
+                self.find_time += duration
+                # Empty results are not cached so waits for elements to appear keep working
+                if value:
+                    self._entries[self._key(command, params)] = \
+                        list(value) if isinstance(value, list) else value
+        elif command in self.invalidate_on:
+            self.invalidate()
+
+    def on_error(self, command, params, error, duration):
+        if isinstance(error, StaleElementReferenceException) or command in self.invalidate_on:
+            self.invalidate()
+
+    @staticmethod
+    def _key(command, params):
+        params = params or {}
+        return command, params.get('using'), params.get('value'), params.get('id')
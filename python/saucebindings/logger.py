@@ -0,0 +1,88 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+# The level is left to the application until configure() is called
+logger = logging.getLogger('saucebindings')
+logger.addHandler(logging.NullHandler())
+
+structured_fields = ('session_id', 'job_link', 'data_center', 'duration')
+
+
+class StructuredFormatter(logging.Formatter):
+
+    def __init__(self, fmt='%(asctime)s %(levelname)s [%(name)s] %(message)s'):
+        super(StructuredFormatter, self).__init__(fmt)
+
+    def format(self, record):
+        message = super(StructuredFormatter, self).format(record)
+        fields = ["{}={}".format(key, getattr(record, key)) for key in structured_fields
+                  if getattr(record, key, None) is not None]
+        return ' '.join([message] + fields)
+
+
+class JobManifest(object):
+
+    def __init__(self, path):
+        self.path = path
+        self.jobs = []
+        self._lock = threading.Lock()
+
+    def add(self, **job):
+        with self._lock:
+            self.jobs.append(job)
+
+    def write(self):
+        with self._lock:
+            content = json.dumps(self.jobs, indent=2)
+        with open(self.path, 'w') as f:
+            f.write(content)
+
+
+class _Settings(object):
+    jenkins = False
+    manifest = None
+    listener = None
+
+
+settings = _Settings()
+
+
+def configure(level=logging.INFO, stream=None, handler=None, jenkins=False, manifest=None):
+    shutdown()
+
+    if handler is None:
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(StructuredFormatter())
+
+    records = queue.SimpleQueue()
+    settings.listener = QueueListener(records, handler, respect_handler_level=True)
+    settings.listener.start()
+    logger.addHandler(QueueHandler(records))
+    logger.setLevel(level)
+    logger.propagate = False
+
+    settings.jenkins = jenkins
+    settings.manifest = JobManifest(manifest) if manifest else None
+    return logger
+
+
+def shutdown():
+    for handler in list(logger.handlers):
+        if isinstance(handler, QueueHandler):
+            logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+    if settings.listener is not None:
+        settings.listener.stop()
+        settings.listener = None
+    if settings.manifest is not None:
+        settings.manifest.write()
+        settings.manifest = None
+
+
+atexit.register(shutdown)
@@ -0,0 +1,121 @@
+from collections import namedtuple
+
+from .elements import _locator, find_function
+
+StepResult = namedtuple('StepResult', ['index', 'action', 'locator', 'error'])
+
+# Runs every step in order and reports an error, or null, per step; later steps are skipped
+# after a failure when stopOnError is set
+macro_script = find_function + """
+function locate(step) {
+  var nodes = find(step);
+  if (!nodes.length) { throw new Error('no such element: ' + step.using + ' ' + step.value); }
+  return nodes[0];
+}
+function fire(el, type, detail) {
+  var event = detail === undefined ? new Event(type, {bubbles: true, cancelable: true})
+                                   : new CustomEvent(type, {bubbles: true, cancelable: true,
+                                                            detail: detail});
+  el.dispatchEvent(event);
+}
+function setValue(el, value) {
+  el.focus();
+  // Use the prototype setter so frameworks tracking the value property see the change
+  var descriptor = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+  if (descriptor && descriptor.set) { descriptor.set.call(el, value); } else { el.value = value; }
+  fire(el, 'input');
+  fire(el, 'change');
+}
+function selectOption(el, step) {
+  var options = Array.prototype.slice.call(el.options || []);
+  var option = options.filter(function (o, i) {
+    if (step.index !== undefined) { return i === step.index; }
+    if (step.text !== undefined) { return o.text.trim() === step.text; }
+    return o.value === step.option;
+  })[0];
+  if (!option) { throw new Error('no such option in ' + step.using + ' ' + step.value); }
+  option.selected = true;
+  fire(el, 'input');
+  fire(el, 'change');
+}
+var steps = arguments[0]; var stopOnError = arguments[1]; var failed = false;
+return steps.map(function (step) {
+  if (failed && stopOnError) { return 'skipped'; }
+  try {
+    var el = locate(step);
+    if (step.action === 'set_value') { setValue(el, step.text); }
+    else if (step.action === 'click') { el.scrollIntoView({block: 'center'}); el.click(); }
+    else if (step.action === 'select_option') { selectOption(el, step); }
+    else if (step.action === 'dispatch_event') { fire(el, step.event, step.detail); }
+    else { throw new Error('unknown action ' + step.action); }
+    return null;
+  } catch (e) {
+    failed = true;
+    return String(e && e.message || e);
+  }
+});"""
+
+
+class MacroResult(object):
+
+    def __init__(self, steps):
+        self.steps = steps
+
+    @property
+    def ok(self):
+        return all(step.error is None for step in self.steps)
+
+    @property
+    def errors(self):
+        return [step for step in self.steps if step.error is not None]
+
+    def __repr__(self):
+        return "MacroResult(steps={}, errors={})".format(len(self.steps), len(self.errors))
+
+
+class Macro(object):
+
+    def __init__(self):
+        self.steps = []
+
+    def set_value(self, locator, text):
+        return self._add('set_value', locator, text=str(text))
+
+    def click(self, locator):
+        return self._add('click', locator)
+
+    def select_option(self, locator, value=None, text=None, index=None):
+        if [value, text, index].count(None) != 2:
+            raise ValueError("Select an option by exactly one of value, text or index")
+        step = {'option': value, 'text': text, 'index': index}
+        return self._add('select_option', locator,
+                         **{key: item for key, item in step.items() if item is not None})
+
+    def dispatch_event(self, locator, event, detail=None):
+        step = {'event': event}
+        if detail is not None:
+            step['detail'] = detail
+        return self._add('dispatch_event', locator, **step)
+
+    def fill(self, fields):
+        for locator, text in fields.items():
+            self.set_value(locator, text)
+        return self
+
+    def _add(self, action, locator, **step):
+        using, value = _locator(*locator)
+        step.update({'action': action, 'using': using, 'value': value, 'locator': tuple(locator)})
+        self.steps.append(step)
+        return self
+
+    def __len__(self):
+        return len(self.steps)
+
+
+def run_macro(driver, macro, stop_on_error=True):
+    if not macro.steps:
+        return MacroResult([])
+    steps = [{key: item for key, item in step.items() if key != 'locator'} for step in macro.steps]
+    errors = driver.execute_script(macro_script, steps, stop_on_error)
+    return MacroResult([StepResult(index, step['action'], step['locator'], error)
+                        for index, (step, error) in enumerate(zip(macro.steps, errors))])
@@ -0,0 +1,99 @@
+import json
+import os
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+_decoder = json.JSONDecoder()
+
+
+def _json_array(f, chunk_size):
+    buffer = ''
+    position = 0
+    index = 0
+    eof = False
+    expecting = '['
+    while True:
+        while position < len(buffer) and buffer[position].isspace():
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of matrix file")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        character = buffer[position]
+        if expecting == '[':
+            if character != '[':
+                raise ValueError("Matrix file must contain a JSON array of entries")
+            position += 1
+            expecting = 'entry'
+        elif character == ']' and expecting in ('entry', 'separator'):
+            return
+        elif expecting == 'separator':
+            if character != ',':
+                raise ValueError("Expected ',' after matrix entry {}".format(index - 1))
+            position += 1
+            expecting = 'entry'
+        else:
+            try:
+                entry, end = _decoder.raw_decode(buffer, position)
+            except ValueError:
+                if eof:
+                    raise
+                # The entry continues in the next chunk
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield 'entry {}'.format(index), entry
+            index += 1
+            position = end
+            expecting = 'separator'
+            # Drop consumed text so memory stays bounded by the largest entry
+            if position > chunk_size:
+                buffer = buffer[position:]
+                position = 0
+
+
+def read_matrix(path, chunk_size=64 * 1024):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.toml':
+        if tomllib is None:
+            raise ImportError("Reading TOML matrix files requires Python 3.11 or the tomli package")
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+        entries = data.get('matrix')
+        if entries is None:
+            entries = next((value for value in data.values() if isinstance(value, list)), [])
+        for index, entry in enumerate(entries):
+            yield 'entry {}'.format(index), entry
+    elif extension in ('.jsonl', '.ndjson'):
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield 'line {}'.format(number), json.loads(line)
+                    except ValueError as e:
+                        yield 'line {}'.format(number), e
+    else:
+        with open(path, encoding='utf-8') as f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            if first == '{':
+                f.seek(0)
+                for index, entry in enumerate(json.load(f).get('matrix', [])):
+                    yield 'entry {}'.format(index), entry
+                return
+            f.seek(0)
+            yield from _json_array(f, chunk_size)
@@ -0,0 +1,151 @@
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import urllib3
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from .api import data_centers
+from .logger import logger
+
+
+class ResolverCache(object):
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host, port=443):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+        address = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)[0][4][0]
+        with self._lock:
+            self.misses += 1
+            self._entries[(host, port)] = (address, now + self.ttl)
+        return address
+
+    def invalidate(self, host=None):
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == host]:
+                    del self._entries[key]
+
+    def prefetch(self, hosts=None, port=443):
+        for host in hosts or data_centers.values():
+            try:
+                self.resolve(host, port)
+            except socket.gaierror as e:
+                logger.warning("Unable to resolve %s: %s", host, e)
+
+
+resolver = ResolverCache()
+
+
+class _CachedResolution(object):
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            self._dns_host = resolver.resolve(host, self.port)
+        except socket.gaierror:
+            return super(_CachedResolution, self)._new_conn()
+        try:
+            return super(_CachedResolution, self)._new_conn()
+        except urllib3.exceptions.NewConnectionError:
+            resolver.invalidate(host)
+            raise
+        finally:
+            # Restore the hostname before TLS so SNI and certificate checks use it
+            self._dns_host = host
+
+
+class CachedHTTPConnection(_CachedResolution, HTTPConnection):
+    pass
+
+
+class CachedHTTPSConnection(_CachedResolution, HTTPSConnection):
+    pass
+
+
+class CachedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = CachedHTTPConnection
+
+
+class CachedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = CachedHTTPSConnection
+
+
+class CachedRemoteConnection(RemoteConnection):
+
+    def __init__(self, remote_server_addr, keep_alive=True, ignore_proxy=False):
+        super(CachedRemoteConnection, self).__init__(remote_server_addr, keep_alive=keep_alive,
+                                                     ignore_proxy=ignore_proxy)
+
+    def _get_connection_manager(self):
+        manager = super(CachedRemoteConnection, self)._get_connection_manager()
+        if not self._proxy_url:
+            manager.pool_classes_by_scheme = {'http': CachedHTTPConnectionPool,
+                                              'https': CachedHTTPSConnectionPool}
+        return manager
+
+    def warm_up(self):
+        self._request('GET', self._url + '/status')
+        return self
+
+
+class ConnectionPool(object):
+
+    def __init__(self):
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def warm_up(self, url, count=1, wait=False):
+        threads = [threading.Thread(target=self._warm, args=(url,), daemon=True)
+                   for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        if wait:
+            for thread in threads:
+                thread.join()
+        return threads
+
+    def take(self, url):
+        with self._lock:
+            connections = self._connections.get(url)
+            if connections:
+                return connections.pop()
+
+    def available(self, url):
+        with self._lock:
+            return len(self._connections.get(url, []))
+
+    def _warm(self, url):
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        try:
+            resolver.resolve(parsed.hostname, port)
+            connection = CachedRemoteConnection(url).warm_up()
+        except Exception as e:
+            logger.warning("Unable to warm up connection to %s: %s", url, e)
+            return
+        with self._lock:
+            self._connections.setdefault(url, []).append(connection)
+
+
+connections = ConnectionPool()
+
+
+def warm_up(data_center='us-west', count=1, wait=False):
+    return connections.warm_up('https://{}/wd/hub'.format(data_centers[data_center]), count, wait)
@@ -2,6 +2,8 @@ import warnings
 from datetime import datetime
 
 from .configs import *
+from .exceptions import InvalidOptionsException
+from .matrix import read_matrix
 from selenium.webdriver import __version__ as seleniumVersion
 import os
 
@@ -48,9 +50,106 @@ sauce_configs = {
     'capture_performance': 'capturePerformance'
 }
 
+browser_factories = {
+    'chrome': 'chrome',
+    'MicrosoftEdge': 'edge',
+    'edge': 'edge',
+    'firefox': 'firefox',
+    'internet explorer': 'ie',
+    'ie': 'ie',
+    'safari': 'safari'
+}
+
+browser_schemas = {
+    'chrome': Configs().chromeConfigs(),
+    'edge': Configs().edgeConfigs(),
+    'firefox': Configs().firefoxConfigs(),
+    'ie': Configs().ieConfigs(),
+    'safari': Configs().safariConfigs()
+}
+
+# camelCase and snake_case keys accepted for each browser, both resolving to camelCase
+_schema_keys = {browser: {**{camel: camel for camel in schema.values()}, **schema}
+                for browser, schema in browser_schemas.items()}
+
+browser_validators = {browser: Configs().validators(schema)
+                      for browser, schema in browser_schemas.items()}
+
+
+def _value_error(validators, key, value):
+    validator = validators.get(key)
+    if value is None or validator is None:
+        return None
+    message = validator(value)
+    if message is not None:
+        return "{} {}, got {!r}".format(key, message, value)
+
+
+def _normalize(data):
+    errors = []
+    if not isinstance(data, dict):
+        return None, None, ["expected an object of capabilities, got {}".format(
+            type(data).__name__)]
+
+    flat = {}
+    for key, value in data.items():
+        if key == 'sauce:options' and isinstance(value, dict):
+            flat.update(value)
+        else:
+            flat[key] = value
+    browser_name = flat.pop('browserName', flat.pop('browser_name', 'chrome'))
+    browser = browser_factories.get(browser_name)
+    if browser is None:
+        return None, None, ["browserName {} is not supported, please select from: {}".format(
+            browser_name, list(browser_factories.keys()))]
+
+    keys = _schema_keys[browser]
+    validators = browser_validators[browser]
+    capabilities = {}
+    for key, value in flat.items():
+        camel = keys.get(key)
+        if camel is None:
+            errors.append("parameter {} not available for {}".format(key, browser_name))
+            continue
+        capabilities[camel] = value
+        error = _value_error(validators, camel, value)
+        if error is not None:
+            errors.append(error)
+    return browser, capabilities, errors
+
 
 class SauceOptions(object):
 
+    @classmethod
+    def from_dict(cls, data):
+        browser, capabilities, errors = _normalize(data)
+        if errors:
+            raise InvalidOptionsException(errors)
+        return getattr(cls, browser)(**capabilities)
+
+    @classmethod
+    def validate_dict(cls, data):
+        return _normalize(data)[2]
+
+    @classmethod
+    def validate_matrix(cls, path):
+        errors = []
+        for location, entry in read_matrix(path):
+            if isinstance(entry, Exception):
+                errors.append("{}: {}".format(location, entry))
+                continue
+            errors.extend("{}: {}".format(location, error) for error in _normalize(entry)[2])
+        return errors
+
+    @classmethod
+    def load_matrix(cls, path, lazy=False):
+        errors = cls.validate_matrix(path)
+        if errors:
+            raise InvalidOptionsException(errors)
+        # A second streamed pass keeps large matrices out of memory when lazy
+        options = (cls.from_dict(entry) for _, entry in read_matrix(path))
+        return options if lazy else list(options)
+
     @classmethod
     def chrome(cls, **kwargs):
         return cls('chrome', validOptions=Configs().chromeConfigs(), **kwargs)
@@ -187,6 +286,7 @@ class SauceOptions(object):
 
     # Sets with camelCase
     def set_capability(self, key, value):
+        self._validate_value(key, value)
         if key in sauce_configs.values():
             self.options['sauce:options'][key] = value
         elif key in w3c_configs.values():
@@ -196,6 +296,7 @@ class SauceOptions(object):
 
     # Sets with snake_case
     def set_option(self, key, value):
+        self._validate_value(sauce_configs.get(key) or w3c_configs.get(key), value)
         if key in sauce_configs.keys():
             self.options['sauce:options'][sauce_configs[key]] = value
         elif key in w3c_configs.keys():
@@ -203,12 +304,23 @@ class SauceOptions(object):
         else:
             raise AttributeError
 
+    def _validate_value(self, key, value):
+        error = _value_error(Configs.value_validators, key, value)
+        if error is not None:
+            raise InvalidOptionsException([error])
+
     def is_mac(self):
         return "mac" in self.platform_name or "OS X" in self.platform_name
 
     def is_windows(self):
         return "Windows" in self.platform_name
 
+    def to_dict(self):
+        data = {key: value for key, value in self.options.items() if key in w3c_configs.values()}
+        data.update({key: value for key, value in self.options['sauce:options'].items()
+                     if key in sauce_configs.values()})
+        return data
+
     def to_capabilities(self):
         if self.selenium_options:
             self.options.update(self.selenium_options)
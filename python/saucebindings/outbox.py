@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import threading
+
+from .api import SauceApi
+
+
+class Outbox(object):
+
+    def __init__(self, path):
+        self.path = path
+        self._replaying = path + '.replaying'
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = None
+
+    def append(self, session_id, **fields):
+        # Leading newline terminates any partial record left by a crash mid-write
+        line = '\n' + json.dumps(dict(fields, session_id=session_id), separators=(',', ':'))
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode('utf-8'))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    def records(self):
+        records = {}
+        for path in (self._replaying, self.path):
+            for record in self._read(path):
+                records.setdefault(record.pop('session_id'), {}).update(record)
+        return records
+
+    def replay(self, api):
+        with self._lock:
+            if os.path.exists(self.path) and not os.path.exists(self._replaying):
+                os.replace(self.path, self._replaying)
+            records = {}
+            for record in self._read(self._replaying):
+                records.setdefault(record.pop('session_id'), {}).update(record)
+
+        failed = {}
+        for session_id, fields in records.items():
+            try:
+                api.update_job(session_id, **fields)
+            except Exception:
+                failed[session_id] = fields
+
+        for session_id, fields in failed.items():
+            self.append(session_id, **fields)
+        with self._lock:
+            if os.path.exists(self._replaying):
+                os.remove(self._replaying)
+        return len(records) - len(failed), len(failed)
+
+    def start(self, api, interval=30):
+        self._flusher = threading.Thread(target=self._flush_periodically, args=(api, interval),
+                                         daemon=True)
+        self._flusher.start()
+
+    def stop(self):
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+
+    def _flush_periodically(self, api, interval):
+        while not self._closed.wait(interval):
+            self.replay(api)
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay Sauce Labs job updates from an outbox')
+    parser.add_argument('path')
+    parser.add_argument('--data-center', default='us-west')
+    args = parser.parse_args(argv)
+
+    username = os.getenv("SAUCE_USERNAME")
+    access_key = os.getenv("SAUCE_ACCESS_KEY")
+    if not username:
+        raise KeyError("Cannot replay outbox, Sauce Username is not set.")
+    elif not access_key:
+        raise KeyError("Cannot replay outbox, Sauce Access Key is not set.")
+
+    sent, failed = Outbox(args.path).replay(SauceApi(username, access_key, args.data_center))
+    print("Sent {} job updates, {} failed and remain in {}".format(sent, failed, args.path))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
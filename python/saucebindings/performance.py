@@ -0,0 +1,162 @@
+import math
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from .exceptions import PerformanceBudgetException
+
+Regression = namedtuple('Regression', ['metric', 'value', 'limit', 'mean', 'stdev', 'samples'])
+Baseline = namedtuple('Baseline', ['mean', 'stdev', 'samples'])
+
+default_metrics = ('load', 'speedIndex', 'firstPaint', 'firstContentfulPaint',
+                   'largestContentfulPaint', 'timeToFirstByte', 'totalBlockingTime')
+
+schema = """
+CREATE TABLE IF NOT EXISTS samples (
+    url TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    recorded REAL NOT NULL,
+    value REAL NOT NULL,
+    build TEXT,
+    regressed INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+index = "CREATE INDEX IF NOT EXISTS samples_by_metric ON samples (url, metric, recorded DESC)"
+
+window = """
+SELECT value FROM samples WHERE url = ? AND metric = ? AND regressed IN ({})
+ORDER BY recorded DESC LIMIT ?
+"""
+
+superseded = """
+DELETE FROM samples WHERE url = ? AND metric = ? AND recorded <
+    (SELECT MIN(recorded) FROM samples WHERE url = ? AND metric = ? AND regressed)
+"""
+
+
+class PerformanceStore(object):
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(schema)
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(samples)")]
+        if 'regressed' not in columns:
+            self._connection.execute(
+                "ALTER TABLE samples ADD COLUMN regressed INTEGER NOT NULL DEFAULT 0")
+        self._connection.execute(index)
+        self._connection.commit()
+
+    def record(self, url, metrics, build=None, recorded=None, regressed=()):
+        recorded = recorded if recorded is not None else time.time()
+        rows = [(url, metric, recorded, float(value), build, int(metric in regressed))
+                for metric, value in metrics.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO samples (url, metric, recorded, value, build, regressed) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._connection.commit()
+
+    def values(self, url, metric, limit=20, regressed=False):
+        # Regressed samples are kept for reporting but left out of the baseline
+        query = window.format('0, 1' if regressed else '0')
+        with self._lock:
+            return [row[0] for row in self._connection.execute(query, (url, metric, limit))]
+
+    def accept(self, url, metric=None):
+        # Makes the regressed samples the new normal, dropping the history they regressed from
+        with self._lock, self._connection:
+            for metric in self._regressed_metrics(url, metric):
+                self._connection.execute(superseded, (url, metric, url, metric))
+                self._connection.execute(
+                    "UPDATE samples SET regressed = 0 WHERE url = ? AND metric = ?", (url, metric))
+
+    def reset(self, url, metric=None):
+        with self._lock, self._connection:
+            if metric is None:
+                self._connection.execute("DELETE FROM samples WHERE url = ?", (url,))
+            else:
+                self._connection.execute(
+                    "DELETE FROM samples WHERE url = ? AND metric = ?", (url, metric))
+
+    def _regressed_metrics(self, url, metric=None):
+        if metric is not None:
+            return [metric]
+        return [row[0] for row in self._connection.execute(
+            "SELECT DISTINCT metric FROM samples WHERE url = ? AND regressed", (url,))]
+
+    def baseline(self, url, metric, limit=20):
+        values = self.values(url, metric, limit)
+        if not values:
+            return None
+        mean = sum(values) / len(values)
+        if len(values) < 2:
+            return Baseline(mean, 0.0, len(values))
+        variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+        return Baseline(mean, math.sqrt(variance), len(values))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class PerformanceBudget(object):
+
+    def __init__(self, store, budgets=None, metrics=default_metrics, tolerance=3.0,
+                 margin=0.1, min_samples=5, window=20, build=None):
+        self.store = store
+        self.budgets = budgets or {}
+        self.metrics = metrics
+        self.tolerance = tolerance
+        self.margin = margin
+        self.min_samples = min_samples
+        self.window = window
+        self.build = build
+
+    def limit(self, url, metric):
+        limits = []
+        if metric in self.budgets:
+            limits.append((self.budgets[metric], None))
+        baseline = self.store.baseline(url, metric, self.window)
+        if baseline is not None and baseline.samples >= self.min_samples:
+            # The relative margin keeps a perfectly stable baseline from failing on noise
+            spread = max(self.tolerance * baseline.stdev, self.margin * baseline.mean)
+            limits.append((baseline.mean + spread, baseline))
+        return min(limits, key=lambda limit: limit[0]) if limits else (None, None)
+
+    def check(self, url, metrics):
+        regressions = []
+        for metric in self.metrics:
+            value = metrics.get(metric)
+            if value is None:
+                continue
+            limit, baseline = self.limit(url, metric)
+            if limit is not None and value > limit:
+                regressions.append(Regression(metric, value, limit,
+                                              baseline.mean if baseline else None,
+                                              baseline.stdev if baseline else None,
+                                              baseline.samples if baseline else 0))
+        # A regressed value would drag the baseline towards itself and hide the next regression,
+        # so it is flagged until accepted
+        self.store.record(url, {metric: metrics[metric] for metric in self.metrics
+                                if metric in metrics}, self.build,
+                          regressed={regression.metric for regression in regressions})
+        return regressions
+
+    def assert_within(self, url, metrics):
+        regressions = self.check(url, metrics)
+        if regressions:
+            raise PerformanceBudgetException(url, regressions)
+        return metrics
@@ -0,0 +1,159 @@
+import json
+import os
+import re
+import time
+
+from .exceptions import UnsupportedPlatformException
+from .logger import logger
+
+platforms_path = '/rest/v1/info/platforms/webdriver'
+
+# Sauce lists older Windows releases by their server names
+_windows_names = {'windows 2008': 'windows 7', 'windows 2012': 'windows 8',
+                  'windows 2012 r2': 'windows 8.1'}
+_mac_prefix = re.compile(r'^(macos|mac os x|os x|mac)\s+')
+_relative_version = re.compile(r'^latest(?:-(\d+))?$')
+
+# Drivers whose major version must match the browser's
+_driver_keys = {'chrome': 'chromedriverVersion', 'microsoftedge': 'edgedriverVersion'}
+
+
+def default_snapshot_path():
+    cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'saucebindings', 'platforms.json')
+
+
+def platform_key(name):
+    name = ' '.join(str(name).lower().split())
+    name = _windows_names.get(name, name)
+    return _mac_prefix.sub('mac ', name)
+
+
+def _version_key(version):
+    return tuple(int(part) for part in version.split('.') if part.isdigit())
+
+
+def _major(version):
+    match = re.match(r'^(\d+)', str(version))
+    return match.group(1) if match else None
+
+
+class PlatformCatalog(object):
+
+    def __init__(self, platforms, fetched=None):
+        self.platforms = platforms
+        self.fetched = fetched
+        self._versions = {}
+        self._browsers = {}
+        for platform in platforms:
+            browser = platform.get('api_name', '').lower()
+            version = platform.get('short_version')
+            if not browser or not version:
+                continue
+            key = (browser, platform_key(platform.get('os', '')))
+            self._versions.setdefault(key, set()).add(version)
+            self._browsers.setdefault(browser, set()).add(key[1])
+        for key, versions in self._versions.items():
+            numeric = sorted((v for v in versions if _version_key(v)), key=_version_key,
+                             reverse=True)
+            self._versions[key] = (frozenset(versions), numeric)
+
+    @classmethod
+    def from_snapshot(cls, path=None):
+        with open(path or default_snapshot_path(), encoding='utf-8') as f:
+            snapshot = json.load(f)
+        return cls(snapshot['platforms'], snapshot.get('fetched'))
+
+    @classmethod
+    def from_api(cls, api):
+        return cls(api.request('GET', platforms_path), time.time())
+
+    @classmethod
+    def load(cls, api=None, path=None, max_age=24 * 60 * 60):
+        path = path or default_snapshot_path()
+        try:
+            catalog = cls.from_snapshot(path)
+        except (OSError, ValueError, KeyError):
+            catalog = None
+        if api is not None and (catalog is None or catalog.age > max_age):
+            try:
+                catalog = cls.from_api(api)
+                catalog.save(path)
+            except Exception as e:
+                if catalog is None:
+                    raise
+                logger.warning("Unable to refresh platform catalog, using snapshot: %s", e)
+        if catalog is None:
+            raise UnsupportedPlatformException(
+                "No platform catalog snapshot at {}; load one with an api first".format(path))
+        return catalog
+
+    @property
+    def age(self):
+        return time.time() - self.fetched if self.fetched else float('inf')
+
+    def save(self, path=None):
+        path = path or default_snapshot_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = '{}.{}.tmp'.format(path, os.getpid())
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump({'fetched': self.fetched, 'platforms': self.platforms}, f)
+        os.replace(partial, path)
+        return path
+
+    def platforms_for(self, browser):
+        return sorted(self._browsers.get(browser.lower(), ()))
+
+    def versions(self, browser, platform):
+        return list(self._versions.get((browser.lower(), platform_key(platform)), ((), []))[1])
+
+    def latest(self, browser, platform, offset=0):
+        versions = self.versions(browser, platform)
+        return versions[offset] if offset < len(versions) else None
+
+    def resolve_version(self, browser, version, platform):
+        match = _relative_version.match(str(version or 'latest'))
+        if match:
+            return self.latest(browser, platform, int(match.group(1) or 0))
+        known = self._versions.get((browser.lower(), platform_key(platform)))
+        if known is None:
+            return None
+        if version in known[0]:
+            return version
+        # Accept a full version when its major release is listed
+        major = _major(version)
+        return version if major in known[0] else None
+
+    def check(self, capabilities):
+        sauce_options = capabilities.get('sauce:options', {})
+        browser = capabilities.get('browserName', 'chrome')
+        platform = capabilities.get('platformName', 'Windows 10')
+        version = capabilities.get('browserVersion', 'latest')
+
+        platforms = self.platforms_for(browser)
+        if not platforms:
+            return ["browserName {} is not available".format(browser)], None
+        if platform_key(platform) not in platforms:
+            return ["{} is not available on {}; available platforms: {}".format(
+                browser, platform, ', '.join(platforms))], None
+
+        resolved = self.resolve_version(browser, version, platform)
+        if resolved is None:
+            return ["{} {} is not available on {}; available versions: {}".format(
+                browser, version, platform,
+                ', '.join(self.versions(browser, platform)[:10]))], None
+
+        driver_key = _driver_keys.get(browser.lower())
+        driver_version = sauce_options.get(driver_key) if driver_key else None
+        if driver_version and _major(resolved) and _major(driver_version) != _major(resolved):
+            return ["{} {} does not match {} {}".format(
+                driver_key, driver_version, browser, resolved)], resolved
+        return [], resolved
+
+    def validate(self, options):
+        errors, resolved = self.check(options.to_capabilities())
+        if errors:
+            raise UnsupportedPlatformException('; '.join(errors))
+        if resolved != options.browser_version:
+            options.set_capability('browserVersion', resolved)
+        return options
@@ -0,0 +1,63 @@
+import pytest
+
+from . import network
+from .options import SauceOptions
+from .session import SauceSession
+from .state import StateCache, ensure_state
+
+
+def pytest_addoption(parser):
+    parser.addini('sauce_data_center', 'Sauce Labs data center for the sauce_session fixture',
+                  default='us-west')
+    parser.addini('sauce_state_dir', 'Directory for saved login state shared by workers')
+    parser.addini('sauce_state_ttl', 'Seconds a saved login state stays valid', default='3600')
+    parser.addini('sauce_warm_up', 'Open a connection to the data center when the run starts',
+                  type='bool', default=True)
+
+
+def pytest_configure(config):
+    if config.getini('sauce_warm_up'):
+        # Runs in every worker, so each one's first session starts on a warm connection
+        network.warm_up(config.getini('sauce_data_center'))
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, 'sauce_report_' + report.when, report)
+
+
+@pytest.fixture(scope='session')
+def sauce_state_cache(request):
+    config = request.config
+    directory = config.getini('sauce_state_dir')
+    if directory:
+        directory = str(config.rootpath / directory)
+    return StateCache(directory or None, ttl=int(config.getini('sauce_state_ttl')))
+
+
+@pytest.fixture
+def sauce_options(request):
+    options = SauceOptions.chrome()
+    options.name = request.node.name
+    return options
+
+
+@pytest.fixture
+def sauce_session(request, sauce_options):
+    session = SauceSession(sauce_options, data_center=request.config.getini('sauce_data_center'))
+    session.start()
+
+    yield session
+
+    report = getattr(request.node, 'sauce_report_call', None)
+    session.stop(report is not None and report.passed)
+
+
+@pytest.fixture
+def sauce_login(sauce_session, sauce_state_cache):
+    def login(key, flow, url=None):
+        return ensure_state(sauce_session, key, flow, sauce_state_cache, url)
+
+    return login
@@ -0,0 +1,118 @@
+import atexit
+import itertools
+import os
+import signal
+import threading
+import time
+import weakref
+
+from .logger import logger
+
+
+class SessionRegistry(object):
+
+    def __init__(self, max_workers=16, timeout=30):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._sessions = {}
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+        self._installed = False
+        self._previous_handler = None
+
+    def register(self, session, driver):
+        self._install()
+        key = next(self._keys)
+        finalizer = weakref.finalize(session, self._collected, key)
+        finalizer.atexit = False
+        with self._lock:
+            self._sessions[key] = (finalizer, driver)
+        session._registry_key = key
+
+    def unregister(self, session):
+        key = getattr(session, '_registry_key', None)
+        with self._lock:
+            finalizer, _ = self._sessions.pop(key, (None, None))
+        if finalizer is not None:
+            finalizer.detach()
+
+    @property
+    def active(self):
+        with self._lock:
+            return [driver for _, driver in self._sessions.values()]
+
+    def reap(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        if not sessions:
+            return 0
+
+        for finalizer, _ in sessions.values():
+            finalizer.detach()
+        drivers = [driver for _, driver in sessions.values()]
+        logger.warning("Quitting %d Sauce sessions that were never stopped", len(drivers))
+        # Executors refuse new work once the interpreter is shutting down, so use plain threads
+        pending = list(drivers)
+        lock = threading.Lock()
+
+        def work():
+            while True:
+                with lock:
+                    if not pending:
+                        return
+                    driver = pending.pop()
+                self._quit(driver)
+
+        threads = []
+        for _ in range(min(self.max_workers, len(drivers))):
+            thread = threading.Thread(target=work, daemon=True)
+            try:
+                thread.start()
+            except RuntimeError:
+                # Python 3.12+ refuses new threads from atexit; quit the rest from this one
+                work()
+                break
+            threads.append(thread)
+        deadline = time.monotonic() + self.timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        return len(drivers)
+
+    def _collected(self, key):
+        with self._lock:
+            _, driver = self._sessions.pop(key, (None, None))
+        if driver is not None:
+            logger.warning("SauceSession was garbage collected without calling stop(); quitting it",
+                           extra={'session_id': driver.session_id})
+            threading.Thread(target=self._quit, args=(driver,), daemon=True).start()
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning("Unable to quit leaked session: %s", e,
+                           extra={'session_id': driver.session_id})
+
+    def _install(self):
+        if self._installed:
+            return
+        self._installed = True
+        atexit.register(self.reap)
+
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGTERM)
+        if previous in (signal.SIG_DFL, None) or callable(previous):
+            self._previous_handler = previous
+            signal.signal(signal.SIGTERM, self._terminate)
+
+    def _terminate(self, signum, frame):
+        self.reap()
+        if callable(self._previous_handler):
+            self._previous_handler(signum, frame)
+        else:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+
+
+registry = SessionRegistry()
@@ -0,0 +1,77 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResultReporter(object):
+
+    def __init__(self, api, max_workers=8, flush_interval=None, outbox=None):
+        self.api = api
+        self.outbox = outbox
+        self.max_workers = max_workers
+        self.flush_interval = flush_interval
+        self.sent = 0
+        self.failures = []
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._timer = None
+        if flush_interval:
+            self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._timer.start()
+
+    def record(self, session_id, result=None, name=None, tags=None):
+        fields = {}
+        if result is not None:
+            fields['passed'] = result
+        if name is not None:
+            fields['name'] = name
+        if tags is not None:
+            fields['tags'] = [tags] if isinstance(tags, str) else list(tags)
+        with self._lock:
+            self._pending.setdefault(session_id, {}).update(fields)
+
+    @property
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batch))) as executor:
+            outcomes = list(executor.map(self._send, batch.items()))
+
+        failures = [outcome for outcome in outcomes if outcome is not None]
+        if self.outbox is not None:
+            for session_id, fields, _ in failures:
+                self.outbox.append(session_id, **fields)
+        with self._lock:
+            self.sent += len(batch) - len(failures)
+            self.failures.extend(failures)
+        return failures
+
+    def close(self):
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        return self.flush()
+
+    def _send(self, item):
+        session_id, fields = item
+        try:
+            self.api.update_job(session_id, **fields)
+        except Exception as e:
+            return session_id, fields, e
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,89 @@
+import base64
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='saucebindings-screenshot')
+
+
+class _Base64Writer(object):
+
+    def __init__(self, f):
+        self.f = f
+        self._pending = b''
+
+    def write(self, data):
+        # JSON encoders may escape the base64 '/' as '\/' or wrap lines with '\n'
+        data = self._pending + data
+        data = data.replace(b'\\/', b'/').replace(b'\\n', b'').replace(b'\\r', b'')
+        if data.endswith(b'\\'):
+            data, self._pending = data[:-1], b'\\'
+        else:
+            self._pending = b''
+        usable = len(data) - len(data) % 4
+        self.f.write(base64.b64decode(data[:usable]))
+        self._pending = data[usable:] + self._pending
+
+    def close(self):
+        if self._pending:
+            self.f.write(base64.b64decode(self._pending))
+
+
+def _value_chunks(response, chunk_size):
+    buffer = b''
+    chunks = response.stream(chunk_size)
+    for chunk in chunks:
+        buffer += chunk
+        key = buffer.find(b'"value"')
+        start = buffer.find(b'"', key + 7) if key != -1 else -1
+        if start != -1:
+            buffer = buffer[start + 1:]
+            break
+    else:
+        raise WebDriverException("Screenshot response did not contain a value")
+
+    while True:
+        end = buffer.find(b'"')
+        if end != -1:
+            yield buffer[:end]
+            return
+        yield buffer
+        buffer = next(chunks, None)
+        if buffer is None:
+            raise WebDriverException("Screenshot response ended before the value was complete")
+
+
+def save_screenshot(command_executor, session_id, path, chunk_size=64 * 1024):
+    url = '{}/session/{}/screenshot'.format(command_executor._url, session_id)
+    headers = command_executor.get_remote_connection_headers(urlparse(url), keep_alive=True)
+    if command_executor.keep_alive:
+        http = command_executor._conn
+    else:
+        http = command_executor._get_connection_manager()
+
+    response = http.request('GET', url, headers=headers, preload_content=False)
+    try:
+        if response.status >= 400:
+            raise WebDriverException("Unable to take screenshot: {} {}".format(
+                response.status, response.data.decode('utf-8', 'replace')))
+
+        partial = path + '.part'
+        try:
+            with open(partial, 'wb') as f:
+                writer = _Base64Writer(f)
+                for chunk in _value_chunks(response, chunk_size):
+                    writer.write(chunk)
+                writer.close()
+        except Exception:
+            os.remove(partial)
+            raise
+        os.replace(partial, path)
+    finally:
+        response.release_conn()
+    return path
+
+
+def save_screenshot_in_background(command_executor, session_id, path, chunk_size=64 * 1024):
+    return _executor.submit(save_screenshot, command_executor, session_id, path, chunk_size)
@@ -1,28 +1,52 @@
+import copy
 import os
+import time
+from concurrent import futures
 
-from sa11y.analyze import Analyze
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.remote.remote_connection import RemoteConnection
+from urllib3.exceptions import HTTPError
+from .accessibility import CachedAnalyze
+from .api import SauceApi, data_centers
 from .options import SauceOptions
+from .elements import query_elements
 from .exceptions import SessionNotStartedException, InvalidPlatformException
+from .heartbeat import Heartbeat
+from .locators import LocatorCache, mutation_commands
+from .logger import logger, settings
+from .macros import run_macro
+from .network import CachedRemoteConnection, connections
+from .registry import registry
+from .screenshots import save_screenshot, save_screenshot_in_background
+from .state import StateCache, capture_state, restore_state
+from .throttling import network_condition
+from .trace import TraceRecorder
+from .waits import wait_for, wait_until
+from .watchdog import Watchdog
 import warnings
 
-data_centers = {
-    'us-west': 'ondemand.us-west-1.saucelabs.com',
-    'us-east': 'ondemand.us-east-1.saucelabs.com',
-    'eu-central': 'ondemand.eu-central-1.saucelabs.com',
-    'apac-southeast': 'ondemand.apac-southeast-1.saucelabs.com'
-}
-
 
 class SauceSession():
 
-    def __init__(self, options=None, data_center='us-west', resolve_ip=False):
+    def __init__(self, options=None, data_center='us-west', resolve_ip=False, reporter=None,
+                 outbox=None, catalog=None):
         self.options = options if options else SauceOptions.chrome()
         self.data_center = data_center if data_center else 'us-west'
         self._remote_url = None
         self._resolve_ip = resolve_ip if resolve_ip else False
+        self.reporter = reporter
+        self.outbox = outbox
+        self.catalog = catalog
         self.driver = None
+        self.accessibility_metrics = None
+        self.heartbeat = None
+        self.watchdog = None
+        self.trace = None
+        self.locator_cache = None
+        self.session_id = None
+        self._started = None
+        self._screenshots = []
 
     @property
     def data_center(self):
@@ -55,22 +79,110 @@ class SauceSession():
         self._remote_url = remote_url
 
     def start(self):
+        if self.catalog is not None:
+            self.catalog.validate(self.options)
+        self._started = time.perf_counter()
         self.driver = self.create_driver(self.remote_url, self.options.to_capabilities())
+        self.session_id = self.driver.session_id
+        registry.register(self, self.driver)
+        logger.info("Started session", extra=self._log_fields(time.perf_counter() - self._started))
         return self.driver
 
     def stop(self, result):
-        if self.driver is not None:
-            self.update_test_result(result)
-            self.driver.quit()
+        self.stop_heartbeat()
+        if self.watchdog is not None and self.watchdog.tripped:
+            # The watchdog has already failed and released this job
+            registry.unregister(self)
             self.driver = None
+        self.stop_watchdog()
+        self.wait_for_screenshots()
+        self.stop_trace()
+        self.disable_locator_cache()
+        if self.driver is not None:
+            if self.reporter is not None:
+                passed = self._passed(result)
+                self.reporter.record(self.driver.session_id, passed)
+                self._log_job(passed)
+            else:
+                self.update_test_result(result)
+            try:
+                self.driver.quit()
+            except (WebDriverException, HTTPError, OSError) as e:
+                if self.outbox is None:
+                    raise
+                # The result is already in the outbox; the job ends itself once it idles out
+                logger.warning("Unable to quit session: %s", e,
+                               extra={'session_id': self.driver.session_id})
+            finally:
+                registry.unregister(self)
+                self.driver = None
 
     def validate_session_started(self, method):
         if self.driver is None:
             raise SessionNotStartedException("Session must be started before executing: {}".format(method))
 
-    def accessibility_results(self, js_lib=None, frames=True, cross_origin=False):
+    def accessibility_results(self, js_lib=None, frames=True, cross_origin=False, include=None,
+                              exclude=None, tags=None, result_types=None):
         self.validate_session_started("accessibility_results")
-        return Analyze(self.driver, js_lib=js_lib, frames=frames, cross_origin=cross_origin).results()
+        analyze = CachedAnalyze(self.driver, js_lib=js_lib, frames=frames,
+                                cross_origin=cross_origin, include=include, exclude=exclude,
+                                tags=tags, result_types=result_types)
+        results = analyze.results()
+        self.accessibility_metrics = analyze.metrics
+        return results
+
+    def accessibility_summary(self, js_lib=None, frames=True, cross_origin=False, include=None,
+                              exclude=None, tags=None):
+        self.validate_session_started("accessibility_summary")
+        analyze = CachedAnalyze(self.driver, js_lib=js_lib, frames=frames,
+                                cross_origin=cross_origin, include=include, exclude=exclude,
+                                tags=tags)
+        summary = analyze.summary()
+        self.accessibility_metrics = analyze.metrics
+        return summary
+
+    def save_screenshot(self, path, background=False):
+        self.validate_session_started('save_screenshot')
+        if not background:
+            return save_screenshot(self.driver.command_executor, self.driver.session_id, path)
+
+        future = save_screenshot_in_background(self.driver.command_executor,
+                                               self.driver.session_id, path)
+        self._screenshots = [f for f in self._screenshots if not f.done()] + [future]
+        return future
+
+    def wait_for_screenshots(self):
+        done, _ = futures.wait(self._screenshots)
+        self._screenshots = []
+        return done
+
+    def query_elements(self, queries, properties=('element', 'text'), all=False):
+        self.validate_session_started('query_elements')
+        return query_elements(self.driver, queries, properties, all)
+
+    def run_macro(self, macro, stop_on_error=True):
+        self.validate_session_started('run_macro')
+        return run_macro(self.driver, macro, stop_on_error)
+
+    def wait_for(self, locator, condition='visible', timeout=10, text=None):
+        self.validate_session_started('wait_for')
+        return wait_for(self.driver, locator, condition, timeout, text)
+
+    def wait_until(self, script, *args, timeout=10):
+        self.validate_session_started('wait_until')
+        return wait_until(self.driver, script, *args, timeout=timeout)
+
+    def save_state(self, key, cache=None):
+        self.validate_session_started('save_state')
+        return (cache or StateCache()).put(key, capture_state(self.driver))
+
+    def restore_state(self, key, cache=None, url=None):
+        self.validate_session_started('restore_state')
+        state = (cache or StateCache()).get(key)
+        if state is None:
+            return False
+        restore_state(self.driver, state, url)
+        return True
 
     def annotate(self, comment):
         self.validate_session_started("annotate")
@@ -78,12 +190,91 @@ class SauceSession():
 
     def pause(self):
         self.validate_session_started("pause")
+        self.stop_heartbeat()
+        self.stop_watchdog()
+        self.wait_for_screenshots()
+        self.stop_trace()
+        self.disable_locator_cache()
         self.driver.execute_script("sauce: break")
-        print("\nThis test has been stopped; no more driver commands will be accepted")
-        print("\nYou can take manual control of the test from the Sauce Labs UI here: {}{}".format(
-            self.data_center_test_url, self.driver.session_id))
+        fields = self._log_fields()
+        logger.info("This test has been stopped; no more driver commands will be accepted",
+                    extra=fields)
+        logger.info("You can take manual control of the test from the Sauce Labs UI here: %s",
+                    fields['job_link'], extra=fields)
+        registry.unregister(self)
         self.driver = None
 
+    def start_heartbeat(self, interval=None):
+        self.validate_session_started('start_heartbeat')
+        if interval is None:
+            interval = self.options.idle_timeout / 3 if self.options.idle_timeout else 30
+        self.stop_heartbeat()
+        self.heartbeat = Heartbeat(self.driver, interval).start()
+        return self.heartbeat
+
+    def stop_heartbeat(self):
+        if self.heartbeat is not None:
+            self.heartbeat.stop()
+            self.heartbeat = None
+
+    def start_watchdog(self, max_duration=None, command_timeout=None, api=None):
+        self.validate_session_started('start_watchdog')
+        self.stop_watchdog()
+        max_duration = max_duration or self.options.max_duration or 1800
+        command_timeout = command_timeout or self.options.command_timeout or 300
+        api = api or SauceApi.from_options(self.options, self.data_center)
+        self.watchdog = Watchdog(self.driver, max_duration=max_duration,
+                                 command_timeout=command_timeout, api=api,
+                                 started=self._started).start()
+        return self.watchdog
+
+    def stop_watchdog(self):
+        if self.watchdog is not None:
+            self.watchdog.stop()
+            self.watchdog = None
+
+    def record_trace(self, path, max_value_size=4096):
+        self.validate_session_started('record_trace')
+        self.stop_trace()
+        capabilities = copy.deepcopy(self.options.to_capabilities())
+        capabilities['sauce:options'] = {key: value for key, value
+                                         in capabilities.get('sauce:options', {}).items()
+                                         if key not in ('username', 'accessKey')}
+        self.trace = TraceRecorder(path, self.driver, capabilities=capabilities,
+                                   max_value_size=max_value_size).start()
+        return self.trace
+
+    def stop_trace(self):
+        if self.trace is not None:
+            self.trace.stop()
+            self.trace = None
+
+    def enable_locator_cache(self, invalidate_on=mutation_commands):
+        self.validate_session_started('enable_locator_cache')
+        self.disable_locator_cache()
+        self.locator_cache = LocatorCache(self.driver, invalidate_on).start()
+        return self.locator_cache
+
+    def disable_locator_cache(self):
+        if self.locator_cache is not None:
+            self.locator_cache.stop()
+            self.locator_cache = None
+
+    def performance_metrics(self, page_url=None):
+        self.validate_session_started('performance_metrics')
+        self._validate_extended_debugging('Performance metrics')
+        if not self.options.capture_performance:
+            error = "Performance metrics require the capture_performance option"
+            raise InvalidPlatformException(error)
+
+        if page_url is not None:
+            self.driver.get(page_url)
+        return self.driver.execute_script('sauce:log', {'type': 'sauce:performance'})
+
+    def assert_performance(self, budget, page_url=None):
+        metrics = self.performance_metrics(page_url)
+        return budget.assert_within(page_url or self.driver.current_url, metrics)
+
     def disable_logging(self):
         self.validate_session_started('disable_logging')
         self.driver.execute_script("sauce: disable log")
@@ -110,54 +301,96 @@ class SauceSession():
 
         self.driver.execute_script("sauce: start network")
 
+    def throttle_network(self, profile=None, download=None, upload=None, latency=None):
+        self.validate_session_started('throttle_network')
+        self._validate_extended_debugging('Network throttling')
+
+        condition = network_condition(profile, download, upload, latency)
+        self.driver.execute_script("sauce:throttleNetwork", condition)
+        return condition
+
+    def reset_network(self):
+        return self.throttle_network('online')
+
     def change_name(self, name):
         self.validate_session_started('change_name')
 
-        self.driver.execute_script("sauce:job-name={}".format(name))
+        self._update_job("sauce:job-name={}".format(name), name=name)
 
     def add_tags(self, tags):
         self.validate_session_started('tags=')
         tags = [tags] if isinstance(tags, str) else tags
 
-        self.driver.execute_script("sauce:job-tags={}".format(",".join(tags)))
+        self._update_job("sauce:job-tags={}".format(",".join(tags)), tags=list(tags))
 
     def update_test_result(self, result_in):
-        result = ''
+        passed = self._passed(result_in)
+        result = '' if passed is None else 'passed' if passed else 'failed'
+
+        self._update_job('sauce:job-result={}'.format(result), passed=passed)
 
+        if self.driver is not None:
+            self._log_job(passed)
+
+    def _update_job(self, script, **fields):
+        try:
+            self.driver.execute_script(script)
+        except (WebDriverException, HTTPError, OSError):
+            if self.outbox is None:
+                raise
+            fields = {key: value for key, value in fields.items() if value is not None}
+            self.outbox.append(self.driver.session_id, **fields)
+
+    def _validate_extended_debugging(self, feature):
+        if self.options.browser_name != 'chrome':
+            error = "{} is only available in Chrome; current browser is: {}".format(
+                feature, self.options.browser_name)
+            raise InvalidPlatformException(error)
+        if not self.options.extended_debugging:
+            error = "{} requires the extended_debugging option".format(feature)
+            raise InvalidPlatformException(error)
+
+    def _passed(self, result_in):
         if result_in is True:
-            result = 'passed'
+            return True
         elif result_in is False:
-            result = 'failed'
-        elif result_in and 'pass' in result_in.lower():
-            warnings.warn(
-                "string arguments are deprecated, please pass in True or False to indicate if the test has passed",
-                DeprecationWarning
-            )
-            result = 'passed'
-        elif result_in and 'fail' in result_in.lower():
-            warnings.warn(
-                "string arguments are deprecated, please pass in True or False to indicate if the test has passed",
-                DeprecationWarning
-            )
-            result = 'failed'
-        else:
-            warnings.warn(
-                "string arguments are deprecated, please pass in True or False to indicate if the test has passed",
-                DeprecationWarning
-            )
-
-        self.driver.execute_script('sauce:job-result={}'.format(result))
+            return False
 
-        # Add output for the Sauce OnDemand Jenkins plugin
-        # The first print statement will automatically populate links on Jenkins to Sauce
-        # The second print statement will output the job link to logging/console
-        if self.driver is not None:
-            print("SauceOnDemandSessioID={} job-name={}".format(self.driver.session_id, self.options.name))
-            print("Test Job Link: {}{}".format(self.data_center_test_url, self.driver.session_id))
+        warnings.warn(
+            "string arguments are deprecated, please pass in True or False to indicate if the test has passed",
+            DeprecationWarning
+        )
+        if result_in and 'pass' in result_in.lower():
+            return True
+        elif result_in and 'fail' in result_in.lower():
+            return False
+
+    def _log_fields(self, duration=None):
+        if duration is None and self._started is not None:
+            duration = time.perf_counter() - self._started
+        return {'session_id': self.driver.session_id,
+                'job_link': "{}{}".format(self.data_center_test_url, self.driver.session_id),
+                'data_center': self.data_center,
+                'duration': None if duration is None else round(duration, 3)}
+
+    def _log_job(self, passed):
+        fields = self._log_fields()
+        # The Sauce OnDemand Jenkins plugin reads this line to populate links on Jenkins to Sauce
+        if settings.jenkins:
+            logger.info("SauceOnDemandSessionID=%s job-name=%s", fields['session_id'],
+                        self.options.name, extra=fields)
+        logger.info("Test Job Link: %s", fields['job_link'], extra=fields)
+        if settings.manifest is not None:
+            settings.manifest.add(name=self.options.name, passed=passed, **fields)
 
     def create_driver(self, url, capabilities):
+        command_executor = connections.take(url)
+        if command_executor is None and self._resolve_ip:
+            command_executor = CachedRemoteConnection(url)
+        elif command_executor is None:
+            command_executor = RemoteConnection(url, keep_alive=True)
         return webdriver.Remote(
-            command_executor=RemoteConnection(url, self._resolve_ip),
+            command_executor=command_executor,
             desired_capabilities=capabilities,
             keep_alive=True
         )
@@ -0,0 +1,164 @@
+import contextlib
+import hashlib
+import json
+import os
+import time
+
+capture_state_script = """function entries(storage) {
+  var values = {};
+  for (var i = 0; i < storage.length; i++) {
+    var key = storage.key(i);
+    values[key] = storage.getItem(key);
+  }
+  return values;
+}
+return {url: window.location.href, origin: window.location.origin,
+        localStorage: entries(window.localStorage),
+        sessionStorage: entries(window.sessionStorage)};"""
+
+# HttpOnly cookies cannot be written from script and are added through WebDriver instead
+restore_state_script = """var state = arguments[0];
+Object.keys(state.localStorage).forEach(function (key) {
+  window.localStorage.setItem(key, state.localStorage[key]);
+});
+Object.keys(state.sessionStorage).forEach(function (key) {
+  window.sessionStorage.setItem(key, state.sessionStorage[key]);
+});
+state.cookies.forEach(function (cookie) {
+  var parts = [cookie.name + '=' + cookie.value, 'path=' + (cookie.path || '/')];
+  if (cookie.domain) { parts.push('domain=' + cookie.domain); }
+  if (cookie.expiry) { parts.push('expires=' + new Date(cookie.expiry * 1000).toUTCString()); }
+  if (cookie.secure) { parts.push('secure'); }
+  if (cookie.sameSite) { parts.push('samesite=' + cookie.sameSite); }
+  document.cookie = parts.join('; ');
+});"""
+
+
+def default_state_directory():
+    cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'saucebindings', 'state')
+
+
+class StateCache(object):
+
+    def __init__(self, directory=None, ttl=3600, max_entries=64):
+        self.directory = directory or default_state_directory()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def path(self, key, suffix='.json'):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + suffix)
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('key') != key or time.time() - state.get('saved', 0) > self.ttl:
+            self._remove(path)
+            return None
+        return state
+
+    def put(self, key, state):
+        state = dict(state, key=key, saved=time.time())
+        path = self.path(key)
+        partial = '{}.{}.tmp'.format(path, os.getpid())
+        # Cookies are credentials; keep the snapshot readable by this user only
+        with open(os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w',
+                  encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(partial, path)
+        self.evict()
+        return state
+
+    @contextlib.contextmanager
+    def lock(self, key, timeout=300):
+        path = self.path(key, '.lock')
+        while True:
+            try:
+                os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+                break
+            except FileExistsError:
+                try:
+                    stale = time.time() - os.path.getmtime(path) > timeout
+                except OSError:
+                    continue
+                if stale:
+                    # The worker holding it died before releasing it
+                    self._remove(path)
+                else:
+                    time.sleep(0.05)
+        try:
+            yield
+        finally:
+            self._remove(path)
+
+    def delete(self, key):
+        self._remove(self.path(key))
+
+    def evict(self):
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                modified = os.path.getmtime(path)
+            except OSError:
+                continue
+            if now - modified > self.ttl:
+                self._remove(path)
+            else:
+                entries.append((modified, path))
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_entries:]:
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def capture_state(driver):
+    state = driver.execute_script(capture_state_script)
+    state['cookies'] = driver.get_cookies()
+    return state
+
+
+def restore_state(driver, state, url=None):
+    current = driver.current_url or ''
+    if not current.startswith(state['origin']):
+        # Cookies and storage can only be written for the document's own origin
+        driver.get(state['origin'])
+
+    now = time.time()
+    cookies = [cookie for cookie in state.get('cookies', [])
+               if not cookie.get('expiry') or cookie['expiry'] > now]
+    driver.execute_script(restore_state_script, {
+        'localStorage': state.get('localStorage', {}),
+        'sessionStorage': state.get('sessionStorage', {}),
+        'cookies': [cookie for cookie in cookies if not cookie.get('httpOnly')]})
+    for cookie in cookies:
+        if cookie.get('httpOnly'):
+            driver.add_cookie(cookie)
+    driver.get(url or state.get('url') or state['origin'])
+
+
+def ensure_state(session, key, login, cache=None, url=None):
+    if session.restore_state(key, cache=cache, url=url):
+        return False
+    cache = cache or StateCache()
+    with cache.lock(key):
+        # Another worker may have logged in while this one waited for the lock
+        if session.restore_state(key, cache=cache, url=url):
+            return False
+        login(session)
+        session.save_state(key, cache=cache)
+    return True
@@ -0,0 +1,101 @@
+import json
+import sqlite3
+import threading
+from collections import namedtuple
+
+from .accessibility import fingerprint
+
+Violation = namedtuple('Violation', ['fingerprint', 'rule', 'impact', 'target', 'url', 'count'])
+
+schema = """
+CREATE TABLE IF NOT EXISTS violations (
+    build TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    impact TEXT,
+    target TEXT NOT NULL,
+    url TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (build, fingerprint)
+) WITHOUT ROWID
+"""
+
+upsert = """
+INSERT INTO violations (build, fingerprint, rule, impact, target, url) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (build, fingerprint) DO UPDATE SET count = count + 1
+"""
+
+diff = """
+SELECT v.fingerprint, v.rule, v.impact, v.target, v.url, v.count FROM violations v
+WHERE v.build = ? AND NOT EXISTS
+    (SELECT 1 FROM violations b WHERE b.build = ? AND b.fingerprint = v.fingerprint)
+ORDER BY v.rule, v.url
+"""
+
+
+def _rows(build, results, url=None):
+    url = url or results.get('url') or ''
+    for rule in results.get('violations') or []:
+        for node in rule.get('nodes') or []:
+            target = node.get('target') or []
+            yield (build, fingerprint(rule['id'], target, url), rule['id'],
+                   node.get('impact') or rule.get('impact'),
+                   json.dumps(target, separators=(',', ':'), ensure_ascii=False), url)
+
+
+class AccessibilityStore(object):
+
+    def __init__(self, path, build):
+        self.path = path
+        self.build = build
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(schema)
+        self._connection.commit()
+
+    def add(self, results, url=None):
+        self.add_all([results], url=url)
+
+    def add_all(self, results, url=None):
+        with self._lock, self._connection:
+            for result in results:
+                self._connection.executemany(upsert, _rows(self.build, result, url))
+
+    def load(self, path):
+        with open(path, 'r') as f:
+            self.add_all(json.loads(line) for line in f if line.strip())
+
+    def violations(self, build=None):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT fingerprint, rule, impact, target, url, count FROM violations "
+                "WHERE build = ? ORDER BY rule, url", (build or self.build,)).fetchall()
+        return [Violation(*row) for row in rows]
+
+    def new_violations(self, baseline):
+        return self._diff(self.build, baseline)
+
+    def fixed_violations(self, baseline):
+        return self._diff(baseline, self.build)
+
+    def builds(self):
+        with self._lock:
+            return [row[0] for row in self._connection.execute(
+                "SELECT DISTINCT build FROM violations ORDER BY build")]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _diff(self, build, other):
+        with self._lock:
+            rows = self._connection.execute(diff, (build, other)).fetchall()
+        return [Violation(*row) for row in rows]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,49 @@
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .session import SauceSession
+from .throttling import network_condition
+
+SweepResult = namedtuple('SweepResult', ['profile', 'duration', 'value', 'error'])
+
+
+class ProfileSweep(object):
+
+    def __init__(self, scenario, profiles, options=None, data_center='us-west', max_workers=None):
+        self.scenario = scenario
+        self.profiles = profiles
+        self.options = options
+        self.data_center = data_center
+        self.max_workers = max_workers or len(profiles)
+        for profile in profiles:
+            network_condition(profile)
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self._run_profile, self.profiles))
+
+    def _run_profile(self, profile):
+        session = SauceSession(self.options, data_center=self.data_center)
+        try:
+            session.start()
+            session.throttle_network(profile)
+            start = time.perf_counter()
+            value = self.scenario(session)
+            result = SweepResult(profile, time.perf_counter() - start, value, None)
+        except Exception as e:
+            result = SweepResult(profile, None, None, e)
+        finally:
+            if session.driver is not None:
+                session.stop(result.error is None)
+        return result
+
+    @staticmethod
+    def report(results):
+        lines = ["{:<24} {:>12}".format('profile', 'seconds')]
+        for result in results:
+            name = result.profile if isinstance(result.profile, str) else \
+                ', '.join('{}={}'.format(k, v) for k, v in sorted(result.profile.items()))
+            duration = 'error' if result.error else '{:.3f}'.format(result.duration)
+            lines.append("{:<24} {:>12}".format(name, duration))
+        return '\n'.join(lines)
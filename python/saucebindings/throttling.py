@@ -0,0 +1,33 @@
+# Presets applied by Sauce Labs for each named profile; download and upload are in kbps,
+# latency in milliseconds
+network_profiles = {
+    'offline': {'download': 0, 'upload': 0, 'latency': 0},
+    'GPRS': {'download': 50, 'upload': 20, 'latency': 500},
+    'Regular 2G': {'download': 250, 'upload': 50, 'latency': 300},
+    'Good 2G': {'download': 450, 'upload': 150, 'latency': 150},
+    'Regular 3G': {'download': 750, 'upload': 250, 'latency': 100},
+    'Good 3G': {'download': 1000, 'upload': 750, 'latency': 40},
+    'Regular 4G': {'download': 4000, 'upload': 3000, 'latency': 20},
+    'DSL': {'download': 2000, 'upload': 1000, 'latency': 5},
+    'Wifi': {'download': 30000, 'upload': 15000, 'latency': 2},
+    'online': None
+}
+
+
+def network_condition(profile=None, download=None, upload=None, latency=None):
+    if profile is not None:
+        if isinstance(profile, dict):
+            return network_condition(**profile)
+        if profile not in network_profiles:
+            raise ValueError("Invalid network profile, please select from:",
+                             list(network_profiles.keys()))
+        return profile
+
+    condition = {'download': download, 'upload': upload, 'latency': latency}
+    condition = {key: value for key, value in condition.items() if value is not None}
+    if not condition:
+        raise ValueError("Provide a network profile or one of download, upload and latency")
+    for key, value in condition.items():
+        if not isinstance(value, (int, float)) or value < 0:
+            raise ValueError("Network {} must be a non-negative number: {}".format(key, value))
+    return condition
@@ -0,0 +1,185 @@
+import json
+import threading
+import time
+from collections import Counter, namedtuple
+
+from selenium import webdriver
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from .commands import CommandListener, monitor
+
+element_key = 'element-6066-11e4-a52e-4f735466cecf'
+legacy_element_key = 'ELEMENT'
+
+# Commands that read from elements already located; runs of these can be folded into a
+# single execute_script call
+batchable_commands = frozenset([
+    Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT,
+    Command.FIND_CHILD_ELEMENTS, Command.GET_ELEMENT_TEXT, Command.GET_ELEMENT_TAG_NAME,
+    Command.GET_ELEMENT_ATTRIBUTE, Command.GET_ELEMENT_PROPERTY,
+    Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY, Command.GET_ELEMENT_RECT,
+    Command.IS_ELEMENT_SELECTED, Command.IS_ELEMENT_ENABLED, Command.W3C_EXECUTE_SCRIPT
+])
+
+BatchableSequence = namedtuple('BatchableSequence', ['start', 'commands', 'duration'])
+ReplayResult = namedtuple('ReplayResult', ['commands', 'errors', 'recorded', 'replayed'])
+
+
+def _encode(value):
+    if isinstance(value, WebElement):
+        return {element_key: value.id}
+    raise TypeError("Unable to record value of type {}".format(type(value).__name__))
+
+
+def _elements(value):
+    if isinstance(value, dict):
+        if element_key in value or legacy_element_key in value:
+            yield value.get(element_key, value.get(legacy_element_key))
+        else:
+            for item in value.values():
+                yield from _elements(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _elements(item)
+
+
+def _remap(value, ids):
+    if isinstance(value, dict):
+        return {key: ids.get(item, item)
+                if isinstance(item, str) and key in ('id', element_key, legacy_element_key)
+                else _remap(item, ids) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_remap(item, ids) for item in value]
+    return value
+
+
+def read_trace(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class TraceRecorder(CommandListener):
+
+    def __init__(self, path, driver, capabilities=None, max_value_size=4096):
+        self.path = path
+        self.driver = driver
+        self.max_value_size = max_value_size
+        self.commands = 0
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+        if capabilities is not None:
+            self._write({'capabilities': capabilities})
+
+    def start(self):
+        monitor(self.driver).add_listener(self)
+        return self
+
+    def stop(self):
+        monitor(self.driver).remove_listener(self)
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def after_command(self, command, params, response, duration):
+        value = response.get('value') if isinstance(response, dict) else None
+        self._record(command, params, duration, value=value)
+
+    def on_error(self, command, params, error, duration):
+        self._record(command, params, duration, error=type(error).__name__)
+
+    def _record(self, command, params, duration, value=None, error=None):
+        entry = {'t': round(time.perf_counter() - duration - self._started, 6),
+                 'd': round(duration, 6), 'c': command}
+        if params:
+            params = {key: item for key, item in params.items() if key != 'sessionId'}
+            if params:
+                entry['p'] = params
+        if error is not None:
+            entry['e'] = error
+        elif value is not None:
+            entry['v'] = value
+        self._write(entry)
+
+    def _write(self, entry):
+        line = json.dumps(entry, separators=(',', ':'), default=_encode)
+        if 'v' in entry and len(line) > self.max_value_size:
+            # Large values such as screenshots only matter for their element references
+            entry['v'] = [{element_key: id} for id in _elements(entry['v'])] or None
+            line = json.dumps(entry, separators=(',', ':'), default=_encode)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + '\n')
+                self.commands += 1
+
+
+class TraceReplayer(object):
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    @classmethod
+    def from_url(cls, url, capabilities):
+        return cls(webdriver.Remote(command_executor=url, desired_capabilities=capabilities))
+
+    def replay(self, path, speed=None):
+        ids = {}
+        errors = []
+        commands = 0
+        recorded = 0.0
+        start = time.perf_counter()
+        for entry in read_trace(path):
+            if 'c' not in entry:
+                continue
+            if speed:
+                delay = entry['t'] / speed - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            commands += 1
+            recorded += entry['d']
+            params = _remap(entry.get('p'), ids)
+            try:
+                response = self.driver.execute(entry['c'], params)
+            except Exception as e:
+                errors.append((commands - 1, entry['c'], e))
+                continue
+            value = json.loads(json.dumps((response or {}).get('value'), default=_encode))
+            ids.update(zip(_elements(entry.get('v')), _elements(value)))
+        return ReplayResult(commands, errors, recorded, time.perf_counter() - start)
+
+
+def batchable_sequences(entries, min_length=3):
+    sequences = []
+    run = []
+
+    def close():
+        if len(run) >= min_length:
+            sequences.append(BatchableSequence(run[0][0], [entry['c'] for _, entry in run],
+                                               sum(entry['d'] for _, entry in run)))
+
+    for index, entry in enumerate(entry for entry in entries if 'c' in entry):
+        if entry['c'] in batchable_commands and 'e' not in entry:
+            run.append((index, entry))
+        else:
+            close()
+            run = []
+    close()
+    return sequences
+
+
+def trace_report(path, min_length=3):
+    entries = list(read_trace(path))
+    commands = [entry for entry in entries if 'c' in entry]
+    sequences = batchable_sequences(commands, min_length)
+    patterns = Counter(tuple(sequence.commands) for sequence in sequences)
+    return {'commands': len(commands),
+            'duration': sum(entry['d'] for entry in commands),
+            'errors': sum(1 for entry in commands if 'e' in entry),
+            'by_command': Counter(entry['c'] for entry in commands),
+            'batchable': sequences,
+            'batchable_commands': sum(len(sequence.commands) for sequence in sequences),
+            'batchable_duration': sum(sequence.duration for sequence in sequences),
+            'patterns': patterns.most_common()}
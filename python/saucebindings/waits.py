@@ -0,0 +1,121 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.remote.command import Command
+
+from .commands import CommandListener, monitor
+from .elements import _locator, displayed_function, find_function
+
+wait_conditions = ('present', 'visible', 'hidden', 'absent', 'enabled', 'text')
+
+# Re-checks on DOM mutations and on every animation frame, so the wait resolves in the frame
+# the condition becomes true; one round trip per wait
+wait_function = """function waitFor(check, timeout, callback) {
+  var done = false; var observer = null; var timer = null;
+  function finish(result) {
+    if (done) { return; }
+    done = true;
+    if (observer) { observer.disconnect(); }
+    clearTimeout(timer);
+    callback(result);
+  }
+  function poll() {
+    if (done) { return; }
+    var value;
+    try { value = check(); } catch (e) { return finish({error: String(e && e.message || e)}); }
+    if (value) { return finish({value: value === true ? true : value}); }
+    window.requestAnimationFrame(poll);
+  }
+  timer = setTimeout(function () { finish({timeout: true}); }, timeout);
+  if (window.MutationObserver) {
+    observer = new window.MutationObserver(poll);
+    observer.observe(document, {subtree: true, childList: true, attributes: true,
+                                characterData: true});
+  }
+  poll();
+}"""
+
+wait_for_element_script = find_function + displayed_function + wait_function + """
+var query = arguments[0]; var condition = arguments[1]; var expected = arguments[2];
+waitFor(function () {
+  var el = find(query)[0];
+  switch (condition) {
+    case 'present': return el;
+    case 'visible': return el && displayed(el) && el;
+    case 'hidden': return !el || !displayed(el);
+    case 'absent': return !el;
+    case 'enabled': return el && !el.disabled && el;
+    case 'text':
+      var text = el && (el.innerText === undefined ? el.textContent : el.innerText);
+      return text && text.indexOf(expected) !== -1 && el;
+  }
+  throw new Error('unknown condition ' + condition);
+}, arguments[3], arguments[arguments.length - 1]);"""
+
+wait_until_script = wait_function + """
+var check = new Function(arguments[0]); var args = arguments[1];
+waitFor(function () { return check.apply(null, args); }, arguments[2],
+        arguments[arguments.length - 1]);"""
+
+
+# Follows the session's script timeout, in seconds, from the commands that set it
+class ScriptTimeout(CommandListener):
+
+    def __init__(self, driver):
+        timeouts = (getattr(driver, 'caps', None) or {}).get('timeouts') or {}
+        script = timeouts.get('script', 30000)
+        self.value = script / 1000 if script is not None else None
+
+    def after_command(self, command, params, response, duration):
+        if command == Command.SET_TIMEOUTS and params and 'script' in params:
+            script = params['script']
+            self.value = script / 1000 if script is not None else None
+
+
+def script_timeout(driver):
+    tracker = vars(driver).get('_sauce_script_timeout')
+    if tracker is None:
+        tracker = driver._sauce_script_timeout = ScriptTimeout(driver)
+        monitor(driver).add_listener(tracker)
+    return tracker
+
+
+def _set_script_timeout(driver, tracker, timeout):
+    driver.set_script_timeout(timeout)
+    tracker.value = timeout
+
+
+def _wait(driver, timeout, description, script, *args):
+    # The driver's script timeout must outlast the wait or it would fail first; the caller's
+    # own timeout is put back afterwards. It is tracked on the client to avoid a round trip
+    tracker = script_timeout(driver)
+    previous = tracker.value
+    raised = previous is not None and previous < timeout + 1
+    if raised:
+        _set_script_timeout(driver, tracker, timeout + 1)
+    try:
+        result = driver.execute_async_script(script, *(args + (int(timeout * 1000),)))
+    except TimeoutException:
+        result = {'timeout': True}
+    finally:
+        if raised:
+            _set_script_timeout(driver, tracker, previous)
+    if result.get('timeout'):
+        raise TimeoutException("Timed out after {}s waiting for {}".format(timeout, description))
+    if 'error' in result:
+        raise TimeoutException("Unable to wait for {}: {}".format(description, result['error']))
+    return result['value']
+
+
+def wait_for(driver, locator, condition='visible', timeout=10, text=None):
+    if condition not in wait_conditions:
+        raise ValueError("Invalid wait condition, please select from:", list(wait_conditions))
+    if condition == 'text' and text is None:
+        raise ValueError("Waiting for text requires the text to wait for")
+    using, value = _locator(*locator)
+    description = "{} {} to be {}".format(using, value, condition) if condition != 'text' else \
+        "{} {} to contain {!r}".format(using, value, text)
+    return _wait(driver, timeout, description, wait_for_element_script,
+                 {'using': using, 'value': value}, condition, text)
+
+
+def wait_until(driver, script, *args, timeout=10):
+    return _wait(driver, timeout, "script condition", wait_until_script, script, list(args))
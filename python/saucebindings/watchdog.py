@@ -0,0 +1,118 @@
+import math
+import threading
+import time
+from collections import deque
+
+from urllib3.exceptions import TimeoutError
+
+from .commands import CommandListener, monitor
+from .logger import logger
+
+connection_attributes = ('_timeout', '_conn', 'keep_alive')
+
+
+class Watchdog(CommandListener):
+
+    def __init__(self, driver, max_duration=None, command_timeout=None, api=None, started=None,
+                 check_interval=1):
+        self.driver = driver
+        self.session_id = driver.session_id
+        self.max_duration = max_duration
+        self.command_timeout = command_timeout
+        self.api = api
+        self.started = started if started is not None else time.perf_counter()
+        self.check_interval = check_interval
+        self.latencies = deque(maxlen=1000)
+        self.reason = None
+        self._connection = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def tripped(self):
+        return self.reason is not None
+
+    def start(self):
+        monitor(self.driver).add_listener(self)
+        if self.command_timeout:
+            self._set_socket_timeout(self.command_timeout)
+        if self.max_duration:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        monitor(self.driver).remove_listener(self)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        self._restore_socket_timeout()
+
+    def after_command(self, command, params, response, duration):
+        self.latencies.append(duration)
+
+    def on_error(self, command, params, error, duration):
+        if isinstance(error, TimeoutError):
+            self.trip("Command {} exceeded the client deadline of {}s".format(
+                command, self.command_timeout))
+
+    def suggested_command_timeout(self, percentile=99, factor=2):
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, int(math.ceil(len(latencies) * percentile / 100.0)) - 1)
+        return max(1, int(math.ceil(latencies[index] * factor)))
+
+    def trip(self, reason):
+        if self.tripped:
+            return
+        self.reason = reason
+        self._stopped.set()
+        logger.warning("Watchdog ending session: %s", reason, extra={'session_id': self.session_id})
+        threading.Thread(target=self._release, daemon=True).start()
+
+    def _release(self):
+        if self.api is not None:
+            try:
+                self.api.update_job(self.session_id, passed=False,
+                                    **{'custom-data': {'watchdog': self.reason}})
+                self.api.stop_job(self.session_id)
+            except Exception as e:
+                logger.warning("Watchdog unable to update job: %s", e,
+                               extra={'session_id': self.session_id})
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+    def _set_socket_timeout(self, timeout):
+        executor = self.driver.command_executor
+        if self._connection is None:
+            self._connection = {name: vars(executor)[name] for name in connection_attributes
+                                if name in vars(executor)}
+        executor._timeout = timeout
+        executor._conn = executor._get_connection_manager()
+        # Retrying a timed out read would multiply the deadline
+        executor._conn.connection_pool_kw['retries'] = False
+        executor.keep_alive = True
+
+    def _restore_socket_timeout(self):
+        if self._connection is None:
+            return
+        executor = self.driver.command_executor
+        pool = vars(executor).get('_conn')
+        for name in connection_attributes:
+            if name in self._connection:
+                setattr(executor, name, self._connection[name])
+            elif name in vars(executor):
+                delattr(executor, name)
+        self._connection = None
+        if pool is not None:
+            pool.clear()
+
+    def _run(self):
+        while not self._stopped.wait(self.check_interval):
+            if time.perf_counter() - self.started > self.max_duration:
+                self.trip("Session exceeded the client deadline of {}s".format(self.max_duration))
+                return
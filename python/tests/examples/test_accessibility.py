@@ -26,5 +26,14 @@ class TestCreateSession(object):
         js_lib = open(os.path.join(os.path.dirname(__file__), "axe.min.js"), "r").read()
         session.accessibility_results(js_lib=js_lib)
 
+        # 4e. Get accessibility results for part of the page with a subset of rules
+        session.accessibility_results(include='#root', exclude='.footer', tags=['wcag2a'])
+
+        # 4f. Get only the violations from accessibility results
+        session.accessibility_results(result_types=['violations'])
+
+        # 4g. Get violation counts and fingerprints without the full results
+        session.accessibility_summary()
+
         # 5. Stop the Session with whether the test passed or failed
         session.stop(True)
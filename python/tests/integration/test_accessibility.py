@@ -45,3 +45,15 @@ class TestAccessibility(object):
         results = session.accessibility_results(frames=False)
         assert numberProblems(results) == 6, "Wrong number of violations found"
         session.stop(True)
+
+    def test_summary_counts_match_results(self):
+        session = SauceSession()
+
+        driver = session.start()
+        driver.get("http://watir.com/examples/nested_iframes.html")
+
+        summary = session.accessibility_summary()
+        assert summary['violations'] == 16, "Wrong number of violations found"
+        assert sum(summary['rules'].values()) == 16
+        assert len(summary['fingerprints']) == 16
+        session.stop(True)
@@ -0,0 +1,39 @@
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: wall-clock check, run with SAUCE_BENCHMARKS=1')
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get('SAUCE_BENCHMARKS'):
+        return
+    skip = pytest.mark.skip(reason='set SAUCE_BENCHMARKS=1 to run benchmarks')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(handler, **attributes):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        for name, value in attributes.items():
+            setattr(server, name, value)
+        server.url = 'http://127.0.0.1:{}'.format(server.server_port)
+        thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.01},
+                                  daemon=True)
+        thread.start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,142 @@
+import pytest
+
+from saucebindings.accessibility import CachedAnalyze, axe_scoped_run_script, axe_state_script
+from saucebindings.accessibility import default_js_lib, fingerprint, js_lib_digest
+from saucebindings.accessibility import axe_summary_run_script
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.session import SauceSession
+
+
+class TestJsLib(object):
+
+    def test_default_js_lib_is_read_once(self):
+        assert default_js_lib() is default_js_lib()
+
+    def test_digest_depends_on_source(self):
+        assert js_lib_digest('var a;') == js_lib_digest('var a;')
+        assert js_lib_digest('var a;') != js_lib_digest('var b;')
+
+
+class TestCachedAnalyze(object):
+
+    def test_injects_when_axe_missing(self, mocker):
+        driver = mocker.MagicMock()
+        driver.execute_script.return_value = [False, []]
+
+        analyze = CachedAnalyze(driver, js_lib='var axe;', frames=False)
+        analyze.results()
+
+        driver.execute_script.assert_any_call('var axe;')
+        assert analyze.metrics.injections == 1
+        assert analyze.metrics.reused == 0
+        assert analyze.metrics.bytes_sent == len('var axe;')
+
+    def test_skips_injection_when_axe_present(self, mocker):
+        driver = mocker.MagicMock()
+        driver.execute_script.return_value = [True, []]
+
+        analyze = CachedAnalyze(driver, js_lib='var axe;', frames=False)
+        analyze.results()
+
+        driver.execute_script.assert_called_once_with(axe_state_script, js_lib_digest('var axe;'))
+        assert analyze.metrics.injections == 0
+        assert analyze.metrics.reused == 1
+        assert analyze.metrics.bytes_sent == 0
+
+    def test_descends_into_frames(self, mocker):
+        driver = mocker.MagicMock()
+        frame = mocker.MagicMock()
+        driver.execute_script.side_effect = [[True, [frame]], [False, []], None, None]
+
+        analyze = CachedAnalyze(driver, js_lib='var axe;')
+        analyze.results()
+
+        driver.switch_to.frame.assert_called_once_with(frame)
+        assert analyze.metrics.frames == 2
+        assert analyze.metrics.injections == 1
+
+
+class TestSession(object):
+
+    def test_requires_start(self):
+        session = SauceSession()
+        with pytest.raises(SessionNotStartedException):
+            session.accessibility_results()
+
+    def test_records_metrics(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+        driver = session.start()
+        driver.execute_script.return_value = [True, []]
+        driver.execute_async_script.return_value = {'violations': []}
+
+        results = session.accessibility_results()
+
+        assert results == {'violations': []}
+        assert session.accessibility_metrics.reused == 1
+
+
+class TestScopedScans(object):
+
+    def test_defaults_to_whole_document_and_all_rules(self, mocker):
+        analyze = CachedAnalyze(mocker.MagicMock())
+
+        assert analyze.context() is None
+        assert analyze.run_options() == {}
+
+    def test_limits_scan_to_selectors(self, mocker):
+        analyze = CachedAnalyze(mocker.MagicMock(), include='#main',
+                                exclude=['.ad', ['iframe', '.x']])
+
+        assert analyze.context() == {'include': [['#main']],
+                                     'exclude': [['.ad'], ['iframe', '.x']]}
+
+    def test_limits_scan_to_tags(self, mocker):
+        analyze = CachedAnalyze(mocker.MagicMock(), tags=['wcag2a', 'best-practice'])
+
+        assert analyze.run_options() == {'runOnly': {'type': 'tag',
+                                                     'values': ['wcag2a', 'best-practice']}}
+
+    def test_filters_result_types_in_browser(self, mocker):
+        driver = mocker.MagicMock()
+        driver.execute_script.return_value = [True, []]
+
+        analyze = CachedAnalyze(driver, frames=False, result_types='violations')
+        analyze.results()
+
+        driver.execute_async_script.assert_called_once_with(
+            axe_scoped_run_script, None, {'resultTypes': ['violations']}, ['violations'])
+
+    def test_raises_exception_if_result_type_is_invalid(self, mocker):
+        with pytest.raises(ValueError):
+            CachedAnalyze(mocker.MagicMock(), result_types=['failures'])
+
+
+class TestSummary(object):
+
+    def test_fingerprint_matches_browser_implementation(self):
+        assert fingerprint('color-contrast', ['#main > a'], 'https://a.com/x') == '1256467645caf6'
+        assert fingerprint('x', [], '') == '1eefe6319f48bd'
+
+    def test_fingerprint_depends_on_rule_target_and_url(self):
+        base = fingerprint('label', ['#name'], 'https://a.com/')
+
+        assert base != fingerprint('region', ['#name'], 'https://a.com/')
+        assert base != fingerprint('label', ['#email'], 'https://a.com/')
+        assert base != fingerprint('label', ['#name'], 'https://b.com/')
+
+    def test_summary_requires_start(self):
+        session = SauceSession()
+        with pytest.raises(SessionNotStartedException):
+            session.accessibility_summary()
+
+    def test_reduces_results_in_browser(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+        driver = session.start()
+        driver.execute_script.return_value = [True, []]
+
+        session.accessibility_summary(tags='wcag2a', frames=False)
+
+        driver.execute_async_script.assert_called_once_with(
+            axe_summary_run_script, None, {'runOnly': {'type': 'tag', 'values': ['wcag2a']}})
@@ -0,0 +1,133 @@
+import json
+import os
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from saucebindings.api import SauceApi
+from saucebindings.artifacts import ArtifactFetcher
+from saucebindings.options import SauceOptions
+from saucebindings.session import SauceSession
+
+video = bytes(range(256)) * 400
+assets = {'abc': {'video': 'video.mp4', 'sauce-log': 'log.json',
+                  'screenshots': ['0000screenshot.png']},
+          'def': {'video': 'video.mp4'}}
+files = {'video.mp4': video, 'log.json': b'[]', '0000screenshot.png': b'png'}
+
+
+class AssetHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers['Range']))
+        parts = self.path.split('/')
+        session_id = parts[5]
+        if session_id not in assets:
+            return self._send(404, b'{}')
+        if len(parts) == 7:
+            return self._send(200, json.dumps(assets[session_id]).encode('utf-8'))
+
+        content = files[parts[7]]
+        if self.headers['Range']:
+            start = int(self.headers['Range'][len('bytes='):-1])
+            if start >= len(content):
+                return self._send(416, b'')
+            return self._send(206, content[start:])
+        self._send(200, content)
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(stub_server):
+    return stub_server(AssetHandler, requests=[])
+
+
+@pytest.fixture
+def fetcher(server, tmp_path):
+    api = SauceApi('test-user', '1234', url=server.url)
+    return ArtifactFetcher(api, str(tmp_path), chunk_size=1024)
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class TestArtifactFetcher(object):
+
+    def test_lists_assets(self, fetcher):
+        assert fetcher.assets('abc') == ['video.mp4', 'log.json', '0000screenshot.png']
+
+    def test_filters_assets(self, fetcher):
+        fetcher.include = ['log.json']
+
+        assert fetcher.assets('abc') == ['log.json']
+
+    def test_downloads_assets_for_each_session(self, fetcher, tmp_path):
+        downloaded = fetcher.fetch(['abc', 'def'])
+
+        assert sorted(downloaded['abc']) == sorted(str(tmp_path / 'abc' / name)
+                                                   for name in files)
+        assert read(str(tmp_path / 'abc' / 'video.mp4')) == video
+        assert read(str(tmp_path / 'def' / 'video.mp4')) == video
+        assert fetcher.downloaded == 4
+        assert fetcher.failures == []
+
+    def test_accepts_sessions(self, fetcher, tmp_path):
+        session = SauceSession()
+        session.session_id = 'def'
+
+        assert fetcher.fetch([session]) == {'def': [str(tmp_path / 'def' / 'video.mp4')]}
+
+    def test_skips_existing_files(self, fetcher, server, tmp_path):
+        os.makedirs(str(tmp_path / 'def'))
+        (tmp_path / 'def' / 'video.mp4').write_bytes(b'existing')
+
+        fetcher.fetch(['def'])
+
+        assert read(str(tmp_path / 'def' / 'video.mp4')) == b'existing'
+        assert fetcher.skipped == 1
+        assert not any('/assets/video.mp4' in path for path, _ in server.requests)
+
+    def test_resumes_partial_files(self, fetcher, server, tmp_path):
+        os.makedirs(str(tmp_path / 'def'))
+        (tmp_path / 'def' / 'video.mp4.part').write_bytes(video[:1000])
+
+        fetcher.fetch(['def'])
+
+        assert read(str(tmp_path / 'def' / 'video.mp4')) == video
+        assert not os.path.exists(str(tmp_path / 'def' / 'video.mp4.part'))
+        assert server.requests[-1][1] == 'bytes=1000-'
+
+    def test_completes_partial_files_that_are_already_whole(self, fetcher, tmp_path):
+        os.makedirs(str(tmp_path / 'def'))
+        (tmp_path / 'def' / 'video.mp4.part').write_bytes(video)
+
+        fetcher.fetch(['def'])
+
+        assert read(str(tmp_path / 'def' / 'video.mp4')) == video
+
+    def test_records_failures(self, fetcher):
+        assert fetcher.fetch(['abc', 'missing'])['missing'] == []
+
+        session_id, name, error = fetcher.failures[0]
+        assert (session_id, name) == ('missing', None)
+        assert error.code == 404
+
+    def test_creates_from_options(self, monkeypatch, tmp_path):
+        monkeypatch.setenv('SAUCE_USERNAME', 'test-user')
+        monkeypatch.setenv('SAUCE_ACCESS_KEY', '1234')
+        options = SauceOptions()
+
+        fetcher = ArtifactFetcher.from_options(options, str(tmp_path), 'eu-central')
+
+        assert fetcher.api.url == 'https://api.eu-central-1.saucelabs.com'
+        assert fetcher.api.username == 'test-user'
@@ -227,6 +227,10 @@ class TestInit(object):
         with pytest.raises(AttributeError):
             SauceOptions.chrome(**options)
 
+    def test_value_error_as_param(self):
+        with pytest.raises(ValueError):
+            SauceOptions.chrome(maxDuration='30m')
+
 
 class TestSettingSpecificOptions(object):
 
@@ -324,6 +328,14 @@ class TestSettingSpecificOptions(object):
         with pytest.raises(AttributeError):
             options.iedriver_version = '3.14'
 
+    def test_setting_invalid_value(self):
+        options = SauceOptions.chrome()
+
+        with pytest.raises(ValueError):
+            options.screen_resolution = '1920 by 1080'
+        with pytest.raises(ValueError):
+            options.page_load_strategy = 'lazy'
+
 
 class TestCapabilitiesCreation(object):
 
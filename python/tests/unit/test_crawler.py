@@ -0,0 +1,143 @@
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, TimeoutException
+
+from saucebindings.crawler import AccessibilityCrawler, sitemap_urls
+
+sitemap = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://a.com/</loc></url>
+  <url><loc> https://a.com/about </loc></url>
+</urlset>"""
+
+
+@pytest.fixture
+def sessions(mocker):
+    started = []
+
+    def create(options, data_center):
+        session = mocker.MagicMock()
+        session.start.return_value = session.driver
+        session.accessibility_results.side_effect = lambda **kwargs: {
+            'url': session.driver.get.call_args[0][0], 'violations': []}
+        started.append(session)
+        return session
+
+    mocker.patch('saucebindings.crawler.SauceSession', side_effect=create)
+    mocker.patch('saucebindings.crawler.connections')
+    return started
+
+
+class TestSitemap(object):
+
+    def test_reads_locations(self, tmp_path):
+        path = tmp_path / 'sitemap.xml'
+        path.write_text(sitemap)
+
+        assert list(sitemap_urls(str(path))) == ['https://a.com/', 'https://a.com/about']
+
+
+class TestCrawl(object):
+
+    def test_warms_up_connections(self, sessions):
+        from saucebindings.crawler import connections
+
+        AccessibilityCrawler(sessions=3)
+
+        connections.warm_up.assert_called_once_with(
+            'https://ondemand.us-west-1.saucelabs.com/wd/hub', 3)
+
+    def test_streams_results_to_sink(self, sessions):
+        found = []
+        crawler = AccessibilityCrawler(sessions=2, sink=lambda url, results: found.append(url))
+
+        stats = crawler.crawl(['https://a.com/{}'.format(i) for i in range(10)])
+
+        assert sorted(found) == sorted('https://a.com/{}'.format(i) for i in range(10))
+        assert stats.completed == 10
+        assert stats.failed == 0
+
+    def test_reuses_sessions_between_pages(self, sessions):
+        crawler = AccessibilityCrawler(sessions=3)
+
+        crawler.crawl(['https://a.com/{}'.format(i) for i in range(12)])
+
+        assert len(sessions) <= 3
+        for session in sessions:
+            session.driver.set_page_load_timeout.assert_called_once_with(30)
+            session.stop.assert_called_once_with(True)
+
+    def test_adds_results_to_store(self, sessions, mocker):
+        store = mocker.MagicMock()
+        crawler = AccessibilityCrawler(sessions=1, sink=store)
+
+        crawler.crawl(['https://a.com/'])
+
+        store.add.assert_called_once_with({'url': 'https://a.com/', 'violations': []})
+
+    def test_records_page_errors(self, sessions, mocker):
+        crawler = AccessibilityCrawler(sessions=1)
+        progress = mocker.MagicMock()
+        crawler.progress = progress
+
+        def create(options, data_center):
+            session = mocker.MagicMock()
+            session.accessibility_results.side_effect = [TimeoutException(), {}]
+            sessions.append(session)
+            return session
+
+        mocker.patch('saucebindings.crawler.SauceSession', side_effect=create)
+
+        stats = crawler.crawl(['https://a.com/slow', 'https://a.com/'])
+
+        assert stats.completed == 1
+        assert stats.failed == 1
+        assert stats.errors[0][0] == 'https://a.com/slow'
+        assert progress.call_count == 2
+
+    def test_replaces_dead_sessions(self, sessions, mocker):
+        crawler = AccessibilityCrawler(sessions=1)
+
+        def create(options, data_center):
+            session = mocker.MagicMock()
+            session.accessibility_results.side_effect = [InvalidSessionIdException(), {}]
+            sessions.append(session)
+            return session
+
+        mocker.patch('saucebindings.crawler.SauceSession', side_effect=create)
+        registry = mocker.patch('saucebindings.crawler.registry')
+
+        crawler.crawl(['https://a.com/1', 'https://a.com/2'])
+
+        assert len(sessions) == 2
+        assert [call[0][0] for call in registry.unregister.call_args_list] == sessions
+
+    def test_crawls_sitemap(self, sessions, tmp_path):
+        path = tmp_path / 'sitemap.xml'
+        path.write_text(sitemap)
+
+        stats = AccessibilityCrawler(sessions=2).crawl(str(path))
+
+        assert stats.pages == 2
+
+    def test_counts_sink_errors_as_failures(self, sessions):
+        def sink(url, results):
+            raise IOError('disk full')
+
+        stats = AccessibilityCrawler(sessions=1, sink=sink).crawl(
+            ['https://a.com/{}'.format(i) for i in range(10)])
+
+        assert stats.completed == 0
+        assert stats.failed == 10
+        assert isinstance(stats.errors[0][1], IOError)
+
+    def test_does_not_hang_when_workers_exit(self, sessions, mocker):
+        crawler = AccessibilityCrawler(sessions=1)
+        crawler.progress = mocker.MagicMock(side_effect=RuntimeError('boom'))
+        mocker.patch('threading.excepthook')
+
+        with pytest.raises(RuntimeError, match='exited'):
+            crawler.crawl(['https://a.com/{}'.format(i) for i in range(10)])
+
+    def test_rejects_summaries_for_stores(self, sessions, mocker):
+        with pytest.raises(ValueError):
+            AccessibilityCrawler(sink=mocker.MagicMock(spec=['add']), summary=True)
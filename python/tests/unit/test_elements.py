@@ -0,0 +1,91 @@
+import pytest
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.webdriver.common.by import By
+
+from saucebindings.elements import bulk_query_script, query_elements
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.session import SauceSession
+
+
+@pytest.fixture
+def driver(mocker):
+    driver = mocker.MagicMock()
+    driver.execute_script.side_effect = lambda script, batch: [
+        {'found': [{name: '{} {}'.format(query['value'], name) for name in query['properties']}]
+         * (2 if query['all'] else 1)} for query in batch]
+    return driver
+
+
+def batch(driver):
+    return driver.execute_script.call_args[0][1]
+
+
+class TestQueryElements(object):
+
+    def test_resolves_all_queries_in_one_call(self, driver):
+        results = query_elements(driver, {'user': (By.ID, 'user-name'),
+                                          'login': (By.CSS_SELECTOR, '#login')})
+
+        driver.execute_script.assert_called_once()
+        assert driver.execute_script.call_args[0][0] == bulk_query_script
+        assert results['login'] == {'element': '#login element', 'text': '#login text'}
+        assert results['user']['text'] == '[id="user-name"] text'
+
+    def test_translates_locators(self, driver):
+        query_elements(driver, {'id': (By.ID, 'a"b'), 'name': (By.NAME, 'q'),
+                                'class': (By.CLASS_NAME, 'btn primary'), 'tag': (By.TAG_NAME, 'h1'),
+                                'xpath': (By.XPATH, '//a'), 'link': (By.LINK_TEXT, 'Home')})
+
+        assert [(query['using'], query['value']) for query in batch(driver)] == [
+            ('css selector', '[id="a\\"b"]'), ('css selector', '[name="q"]'),
+            ('css selector', '.btn.primary'), ('css selector', 'h1'),
+            ('xpath', '//a'), ('link text', 'Home')]
+
+    def test_reads_requested_properties(self, driver):
+        results = query_elements(driver, {'link': (By.ID, 'a')},
+                                 properties=['displayed', 'rect', 'attribute:href'])
+
+        assert sorted(results['link']) == ['attribute:href', 'displayed', 'rect']
+
+    def test_supports_per_query_options(self, driver):
+        results = query_elements(driver, {'items': {'locator': (By.CSS_SELECTOR, 'li'),
+                                                    'properties': ['text'], 'all': True}})
+
+        assert results['items'] == [{'text': 'li text'}, {'text': 'li text'}]
+
+    def test_returns_none_when_missing(self, driver):
+        driver.execute_script.side_effect = lambda script, batch: [{'found': []}]
+
+        assert query_elements(driver, {'missing': (By.ID, 'nope')}) == {'missing': None}
+
+    def test_rejects_invalid_properties(self, driver):
+        with pytest.raises(ValueError):
+            query_elements(driver, {'a': (By.ID, 'a')}, properties=['colour'])
+
+        driver.execute_script.assert_not_called()
+
+    def test_rejects_invalid_strategy(self, driver):
+        with pytest.raises(ValueError):
+            query_elements(driver, {'a': ('shadow', 'a')})
+
+    def test_raises_for_invalid_selector(self, driver):
+        driver.execute_script.side_effect = lambda script, batch: [{'error': 'not a selector'}]
+
+        with pytest.raises(InvalidSelectorException):
+            query_elements(driver, {'a': (By.CSS_SELECTOR, '##')})
+
+
+class TestSession(object):
+
+    def test_requires_start(self):
+        with pytest.raises(SessionNotStartedException):
+            SauceSession().query_elements({'a': (By.ID, 'a')})
+
+    def test_queries_elements(self, mocker):
+        sauce_session = SauceSession()
+        mocker.patch.object(sauce_session, 'create_driver')
+        driver = sauce_session.start()
+        driver.execute_script.return_value = [{'found': [{'text': 'Login'}]}]
+
+        assert sauce_session.query_elements({'a': (By.ID, 'a')}, ['text']) == {
+            'a': {'text': 'Login'}}
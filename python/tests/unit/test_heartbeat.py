@@ -0,0 +1,156 @@
+import gc
+import threading
+import time
+import weakref
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from saucebindings.commands import CommandListener, monitor
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.heartbeat import Heartbeat
+from saucebindings.options import SauceOptions
+from saucebindings.session import SauceSession
+
+
+def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestCommandMonitor(object):
+
+    def test_notifies_listeners(self, mocker):
+        driver = mocker.MagicMock()
+        driver.execute.return_value = {'value': 'x'}
+        listener = monitor(driver).add_listener(mocker.MagicMock(spec=CommandListener))
+
+        assert driver.execute(Command.GET_TITLE) == {'value': 'x'}
+
+        listener.before_command.assert_called_once_with(Command.GET_TITLE, None)
+        assert listener.after_command.call_args[0][:3] == (Command.GET_TITLE, None, {'value': 'x'})
+
+    def test_notifies_listeners_of_errors(self, mocker):
+        driver = mocker.MagicMock()
+        driver.execute.side_effect = ValueError
+        listener = monitor(driver).add_listener(mocker.MagicMock(spec=CommandListener))
+
+        with pytest.raises(ValueError):
+            driver.execute(Command.GET_TITLE)
+
+        assert listener.on_error.call_args[0][0] == Command.GET_TITLE
+        assert monitor(driver).in_flight == 0
+
+    def test_installs_once(self, mocker):
+        driver = mocker.MagicMock()
+
+        assert monitor(driver) is monitor(driver)
+
+    def test_does_not_keep_drivers_alive(self):
+        class Driver(object):
+            def execute(self, command, params=None):
+                return {}
+
+        driver = Driver()
+        monitor(driver)
+        ref = weakref.ref(driver)
+
+        del driver
+        gc.collect()
+
+        assert ref() is None
+
+    def test_tracks_commands_in_flight(self, mocker):
+        driver = mocker.MagicMock()
+        released = threading.Event()
+        driver.execute.side_effect = lambda *args: released.wait()
+        command_monitor = monitor(driver)
+
+        thread = threading.Thread(target=driver.execute, args=(Command.GET_TITLE,))
+        thread.start()
+        assert wait_for(lambda: command_monitor.in_flight == 1)
+        assert command_monitor.idle_time == 0.0
+
+        released.set()
+        thread.join()
+        assert command_monitor.in_flight == 0
+
+
+class TestHeartbeat(object):
+
+    def test_sends_commands_while_idle(self, mocker):
+        driver = mocker.MagicMock()
+        original = driver.execute
+        heartbeat = Heartbeat(driver, interval=0.02).start()
+
+        assert wait_for(lambda: heartbeat.beats >= 2)
+        heartbeat.stop()
+
+        original.assert_called_with(Command.GET_CURRENT_URL, None)
+        assert not heartbeat.running
+
+    def test_pauses_while_commands_are_in_flight(self, mocker):
+        driver = mocker.MagicMock()
+        released = threading.Event()
+        driver.execute.side_effect = lambda *args: released.wait()
+        heartbeat = Heartbeat(driver, interval=0.02).start()
+
+        thread = threading.Thread(target=driver.execute, args=(Command.GET_TITLE,))
+        thread.start()
+        time.sleep(0.1)
+        beats = heartbeat.beats
+        time.sleep(0.1)
+
+        assert heartbeat.beats == beats
+        released.set()
+        thread.join()
+        heartbeat.stop()
+
+    def test_stops_when_command_fails(self, mocker):
+        driver = mocker.MagicMock()
+        driver.execute.side_effect = Exception
+        heartbeat = Heartbeat(driver, interval=0.01).start()
+
+        assert wait_for(lambda: not heartbeat.running)
+
+
+class TestSession(object):
+
+    def test_heartbeat_requires_start(self):
+        session = SauceSession()
+        with pytest.raises(SessionNotStartedException):
+            session.start_heartbeat()
+
+    def test_defaults_interval_to_third_of_idle_timeout(self, mocker):
+        session = SauceSession(SauceOptions.chrome(idleTimeout=90))
+        mocker.patch.object(session, 'create_driver')
+        session.start()
+
+        heartbeat = session.start_heartbeat()
+
+        assert heartbeat.interval == 30
+        session.stop(True)
+
+    def test_stop_ends_heartbeat(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+        session.start()
+        heartbeat = session.start_heartbeat(interval=10)
+
+        session.stop(True)
+
+        assert not heartbeat.running
+        assert session.heartbeat is None
+
+    def test_pause_ends_heartbeat(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+        session.start()
+        heartbeat = session.start_heartbeat(interval=10)
+
+        session.pause()
+
+        assert not heartbeat.running
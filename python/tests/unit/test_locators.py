@@ -0,0 +1,146 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.remote.command import Command
+
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.locators import LocatorCache
+from saucebindings.session import SauceSession
+
+
+class Driver(object):
+
+    def __init__(self):
+        self.session_id = 'abc'
+        self.calls = []
+        self.stale = False
+
+    def execute(self, command, params=None):
+        self.calls.append(command)
+        if command == Command.FIND_ELEMENT and params['value'] == '#missing':
+            raise NoSuchElementException('missing')
+        if command == Command.FIND_ELEMENT:
+            return {'value': 'element-{}'.format(len(self.calls))}
+        if command == Command.FIND_ELEMENTS:
+            return {'value': ['a', 'b']}
+        if self.stale:
+            raise StaleElementReferenceException('stale')
+        return {'value': None}
+
+    def find(self, selector, command=Command.FIND_ELEMENT):
+        return self.execute(command, {'using': 'css selector', 'value': selector})['value']
+
+
+@pytest.fixture
+def driver():
+    return Driver()
+
+
+@pytest.fixture
+def cache(driver):
+    cache = LocatorCache(driver).start()
+    yield cache
+    cache.stop()
+
+
+class TestLocatorCache(object):
+
+    def test_reuses_found_elements(self, driver, cache):
+        first = driver.find('#login')
+
+        assert driver.find('#login') == first
+        assert driver.calls == [Command.FIND_ELEMENT]
+        assert (cache.hits, cache.misses, cache.hit_rate) == (1, 1, 0.5)
+
+    def test_keys_by_locator_and_parent(self, driver, cache):
+        driver.find('#login')
+        driver.find('#logout')
+        driver.execute(Command.FIND_CHILD_ELEMENT,
+                       {'using': 'css selector', 'value': '#login', 'id': 'form'})
+
+        assert len(driver.calls) == 3
+
+    def test_copies_element_lists(self, driver, cache):
+        driver.find('li', Command.FIND_ELEMENTS).append('c')
+
+        assert driver.find('li', Command.FIND_ELEMENTS) == ['a', 'b']
+
+    def test_invalidates_on_navigation(self, driver, cache):
+        driver.find('#login')
+        driver.execute(Command.GET, {'url': 'https://a.com'})
+        driver.find('#login')
+
+        assert driver.calls.count(Command.FIND_ELEMENT) == 2
+        assert cache.invalidations == 1
+
+    def test_invalidates_on_mutation_commands(self, driver, cache):
+        driver.find('#login')
+        driver.execute(Command.CLICK_ELEMENT, {'id': 'element-1'})
+        driver.find('#login')
+
+        assert driver.calls.count(Command.FIND_ELEMENT) == 2
+
+    def test_configures_mutation_commands(self, driver):
+        cache = LocatorCache(driver, invalidate_on=[]).start()
+        driver.find('#login')
+        driver.execute(Command.CLICK_ELEMENT, {'id': 'element-1'})
+        driver.find('#login')
+        driver.execute(Command.REFRESH)
+        driver.find('#login')
+        cache.stop()
+
+        assert driver.calls.count(Command.FIND_ELEMENT) == 2
+
+    def test_invalidates_on_stale_element(self, driver):
+        cache = LocatorCache(driver, invalidate_on=[]).start()
+        driver.find('#login')
+        driver.stale = True
+        with pytest.raises(StaleElementReferenceException):
+            driver.execute(Command.GET_ELEMENT_TEXT, {'id': 'element-1'})
+        driver.find('#login')
+        cache.stop()
+
+        assert driver.calls.count(Command.FIND_ELEMENT) == 2
+
+    def test_does_not_cache_missing_elements(self, driver, cache):
+        for _ in range(2):
+            with pytest.raises(NoSuchElementException):
+                driver.find('#missing')
+
+        assert driver.calls.count(Command.FIND_ELEMENT) == 2
+
+    def test_estimates_saved_time(self, driver, cache):
+        driver.find('#login')
+        cache.find_time = 0.2
+        driver.find('#login')
+        driver.find('#login')
+
+        assert cache.saved_time == pytest.approx(0.4)
+
+    def test_stops_caching(self, driver):
+        LocatorCache(driver).start().stop()
+        driver.find('#login')
+        driver.find('#login')
+
+        assert len(driver.calls) == 2
+
+
+class TestSession(object):
+
+    def test_requires_start(self):
+        with pytest.raises(SessionNotStartedException):
+            SauceSession().enable_locator_cache()
+
+    def test_enables_and_stops_cache(self, mocker, driver):
+        sauce_session = SauceSession()
+        mocker.patch.object(sauce_session, 'create_driver', return_value=driver)
+        mocker.patch.object(sauce_session, 'update_test_result')
+        sauce_session.start()
+        driver.quit = mocker.MagicMock()
+
+        cache = sauce_session.enable_locator_cache()
+        driver.find('#login')
+        driver.find('#login')
+        sauce_session.stop(True)
+
+        assert cache.hits == 1
+        assert sauce_session.locator_cache is None
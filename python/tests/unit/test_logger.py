@@ -0,0 +1,93 @@
+import io
+import json
+import logging
+
+import pytest
+
+from saucebindings import logger as sauce_logger
+from saucebindings.logger import StructuredFormatter, configure, shutdown
+from saucebindings.session import SauceSession
+
+
+@pytest.fixture
+def output():
+    stream = io.StringIO()
+    yield stream
+    shutdown()
+
+
+def run_session(mocker, session_id='abc123'):
+    session = SauceSession()
+    mocker.patch.object(session, 'create_driver')
+    driver = session.start()
+    driver.session_id = session_id
+    session.stop(True)
+    return session
+
+
+class TestFormatter(object):
+
+    def test_appends_structured_fields(self):
+        record = logging.makeLogRecord({'msg': 'Started session', 'session_id': 'abc',
+                                        'data_center': 'us-west', 'duration': 1.5})
+
+        line = StructuredFormatter('%(message)s').format(record)
+
+        assert line == 'Started session session_id=abc data_center=us-west duration=1.5'
+
+
+class TestConfigure(object):
+
+    def test_logs_job_link(self, output, mocker):
+        configure(stream=output)
+
+        run_session(mocker)
+        shutdown()
+
+        assert 'Test Job Link: https://app.saucelabs.com/tests/abc123' in output.getvalue()
+        assert 'session_id=abc123' in output.getvalue()
+        assert 'SauceOnDemandSessionID' not in output.getvalue()
+
+    def test_jenkins_line_is_opt_in(self, output, mocker):
+        configure(stream=output, jenkins=True)
+
+        run_session(mocker)
+        shutdown()
+
+        assert 'SauceOnDemandSessionID=abc123 job-name=None' in output.getvalue()
+
+    def test_writes_manifest_once_at_shutdown(self, output, mocker, tmp_path):
+        manifest = tmp_path / 'jobs.json'
+        configure(stream=output, manifest=str(manifest))
+
+        run_session(mocker, 'one')
+        run_session(mocker, 'two')
+        assert not manifest.exists()
+        shutdown()
+
+        jobs = json.loads(manifest.read_text())
+        assert [job['session_id'] for job in jobs] == ['one', 'two']
+        assert jobs[0]['passed'] is True
+        assert jobs[0]['job_link'] == 'https://app.saucelabs.com/tests/one'
+
+    def test_shutdown_restores_defaults(self, output):
+        configure(stream=output)
+        shutdown()
+
+        assert sauce_logger.logger.propagate is True
+        assert sauce_logger.settings.listener is None
+        assert sauce_logger.logger.level == logging.NOTSET
+
+    def test_follows_application_level_until_configured(self, mocker):
+        root = logging.getLogger()
+        level = root.level
+        handler = mocker.MagicMock(spec=logging.Handler, level=logging.NOTSET)
+        root.setLevel(logging.WARNING)
+        root.addHandler(handler)
+        try:
+            run_session(mocker)
+        finally:
+            root.removeHandler(handler)
+            root.setLevel(level)
+
+        handler.handle.assert_not_called()
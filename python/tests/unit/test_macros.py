@@ -0,0 +1,101 @@
+import pytest
+from selenium.webdriver.common.by import By
+
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.macros import Macro, macro_script, run_macro
+from saucebindings.session import SauceSession
+
+
+@pytest.fixture
+def driver(mocker):
+    driver = mocker.MagicMock()
+    driver.execute_script.side_effect = lambda script, steps, stop_on_error: [None] * len(steps)
+    return driver
+
+
+def steps(driver):
+    return driver.execute_script.call_args[0][1]
+
+
+class TestMacro(object):
+
+    def test_builds_steps(self):
+        macro = Macro() \
+            .set_value((By.ID, 'user-name'), 'standard_user') \
+            .select_option((By.NAME, 'sort'), text='Price (low to high)') \
+            .dispatch_event((By.CSS_SELECTOR, 'form'), 'validate', {'strict': True}) \
+            .click((By.ID, 'login-button'))
+
+        assert [step['action'] for step in macro.steps] == [
+            'set_value', 'select_option', 'dispatch_event', 'click']
+        assert macro.steps[0]['text'] == 'standard_user'
+        assert macro.steps[1]['text'] == 'Price (low to high)'
+        assert macro.steps[2]['detail'] == {'strict': True}
+        assert len(macro) == 4
+
+    def test_fills_fields(self):
+        macro = Macro().fill({(By.ID, 'first'): 'Ada', (By.ID, 'zip'): 12345})
+
+        assert [step['text'] for step in macro.steps] == ['Ada', '12345']
+
+    def test_select_option_requires_one_criterion(self):
+        with pytest.raises(ValueError):
+            Macro().select_option((By.ID, 'sort'))
+        with pytest.raises(ValueError):
+            Macro().select_option((By.ID, 'sort'), value='az', index=0)
+
+    def test_rejects_invalid_locator(self):
+        with pytest.raises(ValueError):
+            Macro().click(('shadow', 'a'))
+
+
+class TestRunMacro(object):
+
+    def test_runs_all_steps_in_one_call(self, driver):
+        macro = Macro().set_value((By.ID, 'user'), 'a').set_value((By.ID, 'pass'), 'b') \
+            .click((By.ID, 'login'))
+
+        result = run_macro(driver, macro)
+
+        driver.execute_script.assert_called_once()
+        assert driver.execute_script.call_args[0][0] == macro_script
+        assert [step['value'] for step in steps(driver)] == [
+            '[id="user"]', '[id="pass"]', '[id="login"]']
+        assert all('locator' not in step for step in steps(driver))
+        assert result.ok
+
+    def test_reports_step_errors(self, driver):
+        driver.execute_script.side_effect = None
+        driver.execute_script.return_value = [None, 'no such element: css selector #b', 'skipped']
+        macro = Macro().click((By.ID, 'a')).click((By.CSS_SELECTOR, '#b')).click((By.ID, 'c'))
+
+        result = run_macro(driver, macro)
+
+        assert not result.ok
+        assert [(step.index, step.locator) for step in result.errors] == [
+            (1, (By.CSS_SELECTOR, '#b')), (2, (By.ID, 'c'))]
+        assert result.steps[2].error == 'skipped'
+
+    def test_passes_stop_on_error(self, driver):
+        run_macro(driver, Macro().click((By.ID, 'a')), stop_on_error=False)
+
+        assert driver.execute_script.call_args[0][2] is False
+
+    def test_skips_empty_macro(self, driver):
+        assert run_macro(driver, Macro()).ok
+        driver.execute_script.assert_not_called()
+
+
+class TestSession(object):
+
+    def test_requires_start(self):
+        with pytest.raises(SessionNotStartedException):
+            SauceSession().run_macro(Macro())
+
+    def test_runs_macro(self, mocker):
+        sauce_session = SauceSession()
+        mocker.patch.object(sauce_session, 'create_driver')
+        driver = sauce_session.start()
+        driver.execute_script.return_value = [None]
+
+        assert sauce_session.run_macro(Macro().click((By.ID, 'login'))).ok
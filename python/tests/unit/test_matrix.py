@@ -0,0 +1,169 @@
+import json
+import time
+
+import pytest
+
+from saucebindings.exceptions import InvalidOptionsException
+from saucebindings.matrix import read_matrix
+from saucebindings.options import SauceOptions
+
+entries = [{'browserName': 'chrome', 'browserVersion': '99', 'maxDuration': 600},
+           {'browserName': 'firefox', 'sauce:options': {'screenResolution': '1920x1080'}},
+           {'browser_name': 'safari', 'platform_name': 'macOS 12', 'avoid_proxy': True}]
+
+
+@pytest.fixture(autouse=True)
+def credentials(monkeypatch):
+    monkeypatch.setenv('SAUCE_USERNAME', 'test-user')
+    monkeypatch.setenv('SAUCE_ACCESS_KEY', '1234')
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content)
+    return str(path)
+
+
+class TestFromDict(object):
+
+    def test_creates_browser_options(self):
+        options = SauceOptions.from_dict(entries[0])
+
+        assert options.browser_name == 'chrome'
+        assert options.browser_version == '99'
+        assert options.max_duration == 600
+        assert options.validOptions == SauceOptions.chrome().validOptions
+
+    def test_accepts_nested_sauce_options_and_snake_case(self):
+        assert SauceOptions.from_dict(entries[1]).screen_resolution == '1920x1080'
+        assert SauceOptions.from_dict(entries[2]).platform_name == 'macOS 12'
+
+    def test_defaults_to_chrome(self):
+        assert SauceOptions.from_dict({}).browser_name == 'chrome'
+
+    def test_reports_all_invalid_keys(self):
+        with pytest.raises(InvalidOptionsException) as error:
+            SauceOptions.from_dict({'browserName': 'firefox', 'chromedriverVersion': '99',
+                                    'capturePerformance': True, 'name': 'ok'})
+
+        assert error.value.errors == ['parameter chromedriverVersion not available for firefox',
+                                      'parameter capturePerformance not available for firefox']
+        assert isinstance(error.value, AttributeError)
+
+    def test_rejects_unknown_browser(self):
+        with pytest.raises(InvalidOptionsException):
+            SauceOptions.from_dict({'browserName': 'netscape'})
+
+    def test_round_trips(self):
+        options = SauceOptions.edge(browserVersion='100', idleTimeout=45, tags=['smoke'])
+
+        data = options.to_dict()
+
+        assert 'accessKey' not in data and 'username' not in data
+        assert SauceOptions.from_dict(data).to_dict() == data
+
+
+class TestLoadMatrix(object):
+
+    def test_loads_json_array(self, tmp_path):
+        path = write(tmp_path, 'matrix.json', json.dumps(entries))
+
+        options = SauceOptions.load_matrix(path)
+
+        assert [o.browser_name for o in options] == ['chrome', 'firefox', 'safari']
+
+    def test_streams_json_array_in_small_chunks(self, tmp_path):
+        path = write(tmp_path, 'matrix.json', json.dumps(entries * 50, indent=2))
+
+        loaded = [entry for _, entry in read_matrix(path, chunk_size=7)]
+
+        assert loaded == entries * 50
+
+    def test_loads_json_object_with_matrix(self, tmp_path):
+        path = write(tmp_path, 'matrix.json', json.dumps({'matrix': entries}))
+
+        assert len(SauceOptions.load_matrix(path)) == 3
+
+    def test_loads_json_lines(self, tmp_path):
+        path = write(tmp_path, 'matrix.jsonl', '\n'.join(json.dumps(e) for e in entries) + '\n\n')
+
+        assert [o.browser_name for o in SauceOptions.load_matrix(path, lazy=True)] == [
+            'chrome', 'firefox', 'safari']
+
+    def test_loads_toml(self, tmp_path):
+        path = write(tmp_path, 'matrix.toml', """
+[[matrix]]
+browserName = "chrome"
+maxDuration = 600
+
+[[matrix]]
+browserName = "firefox"
+[matrix."sauce:options"]
+screenResolution = "1920x1080"
+""")
+
+        options = SauceOptions.load_matrix(path)
+
+        assert options[0].max_duration == 600
+        assert options[1].screen_resolution == '1920x1080'
+
+    def test_reports_every_error_with_location(self, tmp_path):
+        lines = [json.dumps(entries[0]), '{"browserName": "netscape"}', '{broken',
+                 json.dumps({'browserName': 'safari', 'chromedriverVersion': '99'})]
+        path = write(tmp_path, 'matrix.jsonl', '\n'.join(lines))
+
+        with pytest.raises(InvalidOptionsException) as error:
+            SauceOptions.load_matrix(path)
+
+        assert [e.split(':')[0] for e in error.value.errors] == ['line 2', 'line 3', 'line 4']
+
+    def test_rejects_truncated_json(self, tmp_path):
+        path = write(tmp_path, 'matrix.json', json.dumps(entries)[:-10])
+
+        with pytest.raises(ValueError):
+            SauceOptions.load_matrix(path)
+
+
+class TestValueValidation(object):
+
+    def test_reports_invalid_values(self):
+        errors = SauceOptions.validate_dict({
+            'browserName': 'chrome', 'screenResolution': '1920*1080', 'maxDuration': '600',
+            'pageLoadStrategy': 'lazy', 'timeouts': {'implicit': -1}, 'tags': 'smoke',
+            'extendedDebugging': 'yes', 'commandTimeout': 601})
+
+        assert [error.split(' ')[0] for error in errors] == [
+            'screenResolution', 'maxDuration', 'pageLoadStrategy', 'timeouts', 'tags',
+            'extendedDebugging', 'commandTimeout']
+        assert errors[1] == "maxDuration must be an integer from 1 to 10800, got '600'"
+
+    def test_accepts_valid_values(self):
+        assert SauceOptions.validate_dict({
+            'browserName': 'chrome', 'screenResolution': '1920x1080', 'maxDuration': 600,
+            'pageLoadStrategy': 'eager', 'timeouts': {'implicit': 0, 'pageLoad': 30000},
+            'tags': ['smoke'], 'extendedDebugging': True, 'public': 'team',
+            'prerun': {'executable': 'https://a.com/setup.sh'}}) == []
+
+    def test_accepts_tuples_of_tags(self):
+        assert SauceOptions.validate_dict({'tags': ('smoke', 'login')}) == []
+
+    def test_rejects_booleans_as_integers(self):
+        assert SauceOptions.validate_dict({'maxDuration': True})
+
+    def test_reports_values_in_matrix(self, tmp_path):
+        path = write(tmp_path, 'matrix.jsonl', json.dumps({'idleTimeout': 0}))
+
+        assert SauceOptions.validate_matrix(path) == [
+            'line 1: idleTimeout must be an integer from 1 to 1000, got 0']
+
+    @pytest.mark.benchmark
+    def test_validates_large_matrices_quickly(self):
+        entries = [{'browserName': 'firefox', 'browserVersion': str(version % 100),
+                    'platformName': 'Windows 10', 'maxDuration': 1800}
+                   for version in range(100000)]
+
+        start = time.perf_counter()
+        errors = [SauceOptions.validate_dict(entry) for entry in entries]
+
+        assert time.perf_counter() - start < 1
+        assert not any(errors)
@@ -0,0 +1,128 @@
+import socket
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from saucebindings.network import CachedRemoteConnection, ConnectionPool, ResolverCache
+from saucebindings.network import resolver
+from saucebindings.session import SauceSession
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        body = b'{"value": {"ready": true}}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(stub_server):
+    server = stub_server(StatusHandler, paths=[])
+    return 'http://localhost:{}/wd/hub'.format(server.server_port), server
+
+
+class TestResolverCache(object):
+
+    def test_caches_addresses(self, mocker):
+        getaddrinfo = mocker.patch('socket.getaddrinfo',
+                                   return_value=[(2, 1, 6, '', ('10.0.0.1', 443))])
+        cache = ResolverCache()
+
+        assert cache.resolve('ondemand.us-west-1.saucelabs.com') == '10.0.0.1'
+        assert cache.resolve('ondemand.us-west-1.saucelabs.com') == '10.0.0.1'
+
+        getaddrinfo.assert_called_once()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_expires_addresses(self, mocker):
+        getaddrinfo = mocker.patch('socket.getaddrinfo',
+                                   return_value=[(2, 1, 6, '', ('10.0.0.1', 443))])
+        cache = ResolverCache(ttl=0)
+
+        cache.resolve('ondemand.us-west-1.saucelabs.com')
+        cache.resolve('ondemand.us-west-1.saucelabs.com')
+
+        assert getaddrinfo.call_count == 2
+
+    def test_invalidates_host(self, mocker):
+        getaddrinfo = mocker.patch('socket.getaddrinfo',
+                                   return_value=[(2, 1, 6, '', ('10.0.0.1', 443))])
+        cache = ResolverCache()
+
+        cache.resolve('ondemand.us-west-1.saucelabs.com')
+        cache.invalidate('ondemand.us-west-1.saucelabs.com')
+        cache.resolve('ondemand.us-west-1.saucelabs.com')
+
+        assert getaddrinfo.call_count == 2
+
+    def test_prefetches_data_centers(self, mocker):
+        getaddrinfo = mocker.patch('socket.getaddrinfo', side_effect=socket.gaierror)
+
+        ResolverCache().prefetch()
+
+        assert getaddrinfo.call_count == 4
+
+
+class TestCachedRemoteConnection(object):
+
+    def test_connects_through_resolver(self, server):
+        url, stub = server
+        resolver.invalidate('localhost')
+        misses = resolver.misses
+
+        CachedRemoteConnection(url).warm_up()
+
+        assert stub.paths == ['/wd/hub/status']
+        assert resolver.misses == misses + 1
+
+
+class TestConnectionPool(object):
+
+    def test_hands_out_warm_connections(self, server):
+        url, stub = server
+        pool = ConnectionPool()
+
+        pool.warm_up(url, count=2, wait=True)
+
+        assert pool.available(url) == 2
+        assert isinstance(pool.take(url), CachedRemoteConnection)
+        assert pool.available(url) == 1
+
+    def test_returns_nothing_when_cold(self):
+        assert ConnectionPool().take('http://localhost/wd/hub') is None
+
+    def test_skips_failed_warm_ups(self):
+        pool = ConnectionPool()
+
+        pool.warm_up('http://127.0.0.1:1/wd/hub', wait=True)
+
+        assert pool.available('http://127.0.0.1:1/wd/hub') == 0
+
+
+class TestSession(object):
+
+    def test_uses_cached_resolution_when_resolving_ip(self, mocker):
+        remote = mocker.patch('saucebindings.session.webdriver.Remote')
+        session = SauceSession(resolve_ip=True)
+
+        session.start()
+
+        assert isinstance(remote.call_args[1]['command_executor'], CachedRemoteConnection)
+
+    def test_uses_warm_connection(self, mocker):
+        remote = mocker.patch('saucebindings.session.webdriver.Remote')
+        warm = mocker.MagicMock()
+        mocker.patch('saucebindings.session.connections.take', return_value=warm)
+
+        SauceSession().start()
+
+        assert remote.call_args[1]['command_executor'] is warm
@@ -0,0 +1,133 @@
+import socket
+
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from saucebindings.outbox import Outbox, main
+from saucebindings.registry import registry
+from saucebindings.reporter import ResultReporter
+from saucebindings.session import SauceSession
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return Outbox(str(tmp_path / 'outbox.jsonl'))
+
+
+class TestOutbox(object):
+
+    def test_appends_records(self, outbox):
+        outbox.append('one', passed=True)
+        outbox.append('two', name='Test Two')
+
+        assert outbox.records() == {'one': {'passed': True}, 'two': {'name': 'Test Two'}}
+
+    def test_deduplicates_by_session_id(self, outbox):
+        outbox.append('one', passed=False)
+        outbox.append('one', name='Test One')
+        outbox.append('one', passed=True)
+
+        assert outbox.records() == {'one': {'passed': True, 'name': 'Test One'}}
+
+    def test_ignores_partial_records(self, outbox):
+        with open(outbox.path, 'w') as f:
+            f.write('{"session_id":"one","pas')
+        outbox.append('two', passed=True)
+
+        assert outbox.records() == {'two': {'passed': True}}
+
+    def test_replay_sends_merged_records(self, outbox, mocker):
+        api = mocker.MagicMock()
+        outbox.append('one', passed=False)
+        outbox.append('one', passed=True)
+
+        assert outbox.replay(api) == (1, 0)
+
+        api.update_job.assert_called_once_with('one', passed=True)
+        assert outbox.records() == {}
+
+    def test_replay_keeps_failed_records(self, outbox, mocker):
+        api = mocker.MagicMock()
+        api.update_job.side_effect = IOError
+        outbox.append('one', passed=True)
+
+        assert outbox.replay(api) == (0, 1)
+
+        assert outbox.records() == {'one': {'passed': True}}
+
+    def test_replay_recovers_interrupted_replay(self, outbox, mocker):
+        api = mocker.MagicMock()
+        outbox.append('one', passed=True)
+        with open(outbox.path + '.replaying', 'w') as f:
+            f.write('{"session_id":"two","passed":false}\n')
+
+        assert outbox.replay(api) == (1, 0)
+        assert outbox.replay(api) == (1, 0)
+
+        assert api.update_job.call_count == 2
+
+    def test_cli_replays_with_environment_credentials(self, outbox, mocker, monkeypatch):
+        monkeypatch.setenv("SAUCE_USERNAME", "test-user")
+        monkeypatch.setenv("SAUCE_ACCESS_KEY", "1234")
+        update_job = mocker.patch('saucebindings.outbox.SauceApi.update_job')
+        outbox.append('one', passed=True)
+
+        assert main([outbox.path]) == 0
+
+        update_job.assert_called_once_with('one', passed=True)
+
+
+class TestIntegration(object):
+
+    def test_reporter_writes_failures_to_outbox(self, outbox, mocker):
+        api = mocker.MagicMock()
+        api.update_job.side_effect = IOError
+        reporter = ResultReporter(api, outbox=outbox)
+        reporter.record('one', True)
+
+        reporter.flush()
+
+        assert outbox.records() == {'one': {'passed': True}}
+
+    def test_session_writes_failed_updates_to_outbox(self, outbox, mocker):
+        session = SauceSession(outbox=outbox)
+        mocker.patch.object(session, 'create_driver')
+        driver = session.start()
+        driver.session_id = 'one'
+        driver.execute_script.side_effect = WebDriverException
+
+        session.change_name('Test One')
+        session.stop(False)
+
+        assert outbox.records() == {'one': {'name': 'Test One', 'passed': False}}
+        driver.quit.assert_called_once()
+
+    def test_session_writes_unreachable_updates_to_outbox(self, outbox, mocker):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        executor = RemoteConnection('http://127.0.0.1:{}'.format(port))
+        driver = webdriver.Remote.__new__(webdriver.Remote)
+        driver.command_executor = executor
+        driver.session_id = 'one'
+        session = SauceSession(outbox=outbox)
+        mocker.patch.object(session, 'create_driver', return_value=driver)
+        session.start()
+
+        session.change_name('Test One')
+        session.stop(True)
+
+        assert outbox.records() == {'one': {'name': 'Test One', 'passed': True}}
+        assert session.driver is None
+        assert driver not in registry.active
+
+    def test_session_raises_without_outbox(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+        driver = session.start()
+        driver.execute_script.side_effect = WebDriverException
+
+        with pytest.raises(WebDriverException):
+            session.change_name('Test One')
@@ -0,0 +1,209 @@
+import sqlite3
+
+import pytest
+
+from saucebindings.exceptions import (InvalidPlatformException, PerformanceBudgetException,
+                                      SessionNotStartedException)
+from saucebindings.options import SauceOptions
+from saucebindings.performance import PerformanceBudget, PerformanceStore
+from saucebindings.session import SauceSession
+
+url = 'https://www.saucedemo.com/'
+
+
+@pytest.fixture
+def store(tmp_path):
+    with PerformanceStore(str(tmp_path / 'performance.db')) as store:
+        yield store
+
+
+def seed(store, *loads):
+    for recorded, load in enumerate(loads):
+        store.record(url, {'load': load, 'speedIndex': load / 2}, recorded=recorded)
+
+
+class TestPerformanceStore(object):
+
+    def test_returns_latest_values_first(self, store):
+        seed(store, 100, 200, 300)
+
+        assert store.values(url, 'load', limit=2) == [300, 200]
+
+    def test_ignores_non_numeric_metrics(self, store):
+        store.record(url, {'load': 100, 'score': None, 'details': {}})
+
+        assert store.values(url, 'score') == []
+        assert store.values(url, 'load') == [100]
+
+    def test_computes_baseline(self, store):
+        seed(store, 100, 110, 90)
+
+        baseline = store.baseline(url, 'load')
+
+        assert baseline.mean == 100
+        assert baseline.stdev == 10
+        assert baseline.samples == 3
+
+    def test_no_baseline_without_samples(self, store):
+        assert store.baseline(url, 'load') is None
+
+    def test_adds_regressed_column_to_existing_databases(self, tmp_path):
+        path = str(tmp_path / 'old.db')
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE samples (url TEXT NOT NULL, metric TEXT NOT NULL, "
+                           "recorded REAL NOT NULL, value REAL NOT NULL, build TEXT)")
+        connection.execute("INSERT INTO samples VALUES (?, 'load', 0, 100, NULL)", (url,))
+        connection.commit()
+        connection.close()
+
+        with PerformanceStore(path) as store:
+            assert store.values(url, 'load') == [100]
+
+    def test_keeps_urls_separate(self, store):
+        seed(store, 100)
+        store.record('https://example.com', {'load': 900})
+
+        assert store.values(url, 'load') == [100]
+
+
+class TestPerformanceBudget(object):
+
+    def test_passes_within_tolerance(self, store):
+        seed(store, 1000, 1100, 900, 1050, 950)
+        budget = PerformanceBudget(store)
+
+        assert budget.check(url, {'load': 1200}) == []
+
+    def test_detects_regression_from_baseline(self, store):
+        seed(store, 1000, 1100, 900, 1050, 950)
+        budget = PerformanceBudget(store)
+
+        regression, = budget.check(url, {'load': 2000})
+
+        assert regression.metric == 'load'
+        assert regression.mean == 1000
+        assert regression.samples == 5
+        assert 1000 < regression.limit < 2000
+
+    def test_stable_baseline_allows_margin(self, store):
+        seed(store, 1000, 1000, 1000, 1000, 1000)
+        budget = PerformanceBudget(store)
+
+        assert budget.check(url, {'load': 1090}) == []
+        assert len(budget.check(url, {'load': 1200})) == 1
+
+    def test_needs_minimum_samples(self, store):
+        seed(store, 1000, 1000)
+        budget = PerformanceBudget(store)
+
+        assert budget.check(url, {'load': 5000}) == []
+
+    def test_enforces_absolute_budget(self, store):
+        budget = PerformanceBudget(store, budgets={'load': 3000})
+
+        regression, = budget.check(url, {'load': 3500})
+
+        assert regression.limit == 3000
+        assert regression.mean is None
+
+    def test_records_samples_for_same_run(self, store):
+        budget = PerformanceBudget(store, min_samples=3)
+
+        for load in (1000, 1000, 1000):
+            budget.check(url, {'load': load})
+
+        assert len(budget.check(url, {'load': 2000})) == 1
+
+    def test_keeps_regressions_out_of_baseline(self, store):
+        seed(store, 1000, 1000, 1000, 1000, 1000)
+        budget = PerformanceBudget(store)
+
+        for _ in range(3):
+            assert len(budget.check(url, {'load': 2000, 'speedIndex': 500})) == 1
+
+        assert store.values(url, 'load') == [1000] * 5
+        assert store.values(url, 'load', regressed=True)[:3] == [2000] * 3
+        assert store.values(url, 'speedIndex')[:3] == [500] * 3
+
+    def test_accepts_regressions_as_new_baseline(self, store):
+        seed(store, 1000, 1000, 1000, 1000, 1000)
+        budget = PerformanceBudget(store, min_samples=3)
+        for _ in range(3):
+            budget.check(url, {'load': 2000, 'speedIndex': 500})
+
+        store.accept(url)
+
+        assert store.values(url, 'load') == [2000] * 3
+        assert store.values(url, 'speedIndex') == [500] * 8
+        assert budget.check(url, {'load': 2000}) == []
+
+    def test_resets_baseline(self, store):
+        seed(store, 1000, 1000, 1000)
+        store.record('https://example.com', {'load': 900})
+
+        store.reset(url, 'speedIndex')
+        assert store.values(url, 'speedIndex') == []
+        assert len(store.values(url, 'load')) == 3
+
+        store.reset(url)
+        assert store.baseline(url, 'load') is None
+        assert store.values('https://example.com', 'load') == [900]
+
+    def test_assert_raises_with_regressions(self, store):
+        budget = PerformanceBudget(store, budgets={'load': 3000, 'speedIndex': 1000})
+
+        with pytest.raises(PerformanceBudgetException) as error:
+            budget.assert_within(url, {'load': 3500, 'speedIndex': 500})
+
+        assert [r.metric for r in error.value.regressions] == ['load']
+        assert url in str(error.value)
+
+
+class TestSession(object):
+
+    def options(self):
+        options = SauceOptions.chrome()
+        options.capture_performance = True
+        options.extended_debugging = True
+        return options
+
+    def test_requires_start(self):
+        sauce_session = SauceSession(self.options())
+        with pytest.raises(SessionNotStartedException):
+            sauce_session.performance_metrics()
+
+    def test_requires_chrome(self, mocker):
+        sauce_session = SauceSession(SauceOptions.firefox())
+        mocker.patch.object(sauce_session, 'create_driver')
+        sauce_session.start()
+
+        with pytest.raises(InvalidPlatformException):
+            sauce_session.performance_metrics()
+
+    def test_requires_capture_performance(self, mocker):
+        sauce_session = SauceSession(SauceOptions.chrome())
+        mocker.patch.object(sauce_session, 'create_driver')
+        sauce_session.start()
+
+        with pytest.raises(InvalidPlatformException):
+            sauce_session.performance_metrics()
+
+    def test_gets_metrics(self, mocker):
+        sauce_session = SauceSession(self.options())
+        mocker.patch.object(sauce_session, 'create_driver')
+        driver = sauce_session.start()
+        driver.execute_script.return_value = {'load': 1200}
+
+        assert sauce_session.performance_metrics(url) == {'load': 1200}
+
+        driver.get.assert_called_once_with(url)
+        driver.execute_script.assert_called_once_with('sauce:log', {'type': 'sauce:performance'})
+
+    def test_asserts_performance(self, mocker, store):
+        sauce_session = SauceSession(self.options())
+        mocker.patch.object(sauce_session, 'create_driver')
+        driver = sauce_session.start()
+        driver.execute_script.return_value = {'load': 3500}
+
+        with pytest.raises(PerformanceBudgetException):
+            sauce_session.assert_performance(PerformanceBudget(store, budgets={'load': 3000}), url)
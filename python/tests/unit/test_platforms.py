@@ -0,0 +1,164 @@
+import json
+import time
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from saucebindings.api import SauceApi
+from saucebindings.exceptions import InvalidPlatformException, UnsupportedPlatformException
+from saucebindings.options import SauceOptions
+from saucebindings.platforms import PlatformCatalog, platform_key
+from saucebindings.session import SauceSession
+
+
+def platform(browser, version, os):
+    return {'api_name': browser, 'short_version': version, 'os': os,
+            'automation_backend': 'webdriver'}
+
+
+platforms = [platform('chrome', version, os) for version in ('98', '99', '100', 'beta')
+             for os in ('Windows 10', 'Mac 12')] + \
+    [platform('chrome', '70', 'Windows 2008'),
+     platform('firefox', '97', 'Windows 10'), platform('firefox', '98', 'Windows 10'),
+     platform('safari', '15', 'Mac 12'), platform('MicrosoftEdge', '99', 'Windows 10')]
+
+
+@pytest.fixture
+def catalog():
+    return PlatformCatalog(platforms, fetched=time.time())
+
+
+class PlatformsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        body = json.dumps(platforms).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api(stub_server):
+    server = stub_server(PlatformsHandler, requests=[])
+    api = SauceApi('test-user', '1234', url=server.url)
+    api.server = server
+    return api
+
+
+class TestPlatformCatalog(object):
+
+    def test_normalizes_platform_names(self):
+        assert platform_key('Mac 12') == platform_key('macOS 12') == platform_key('OS X 12')
+        assert platform_key('Windows 2008') == 'windows 7'
+
+    def test_lists_versions_newest_first(self, catalog):
+        assert catalog.versions('chrome', 'macOS 12') == ['100', '99', '98']
+
+    def test_resolves_latest(self, catalog):
+        assert catalog.resolve_version('chrome', 'latest', 'Windows 10') == '100'
+        assert catalog.resolve_version('chrome', 'latest-2', 'Windows 10') == '98'
+        assert catalog.resolve_version('chrome', 'latest-5', 'Windows 10') is None
+
+    def test_accepts_listed_and_full_versions(self, catalog):
+        assert catalog.resolve_version('chrome', 'beta', 'Windows 10') == 'beta'
+        assert catalog.resolve_version('chrome', '99.0.4844.51', 'Windows 10') == '99.0.4844.51'
+        assert catalog.resolve_version('chrome', '70', 'Windows 10') is None
+
+    def test_rejects_unsupported_combinations(self, catalog):
+        assert catalog.check({'browserName': 'safari', 'platformName': 'Windows 10'})[0]
+        assert catalog.check({'browserName': 'chrome', 'browserVersion': '70',
+                              'platformName': 'Windows 10'})[0]
+        assert catalog.check({'browserName': 'opera'})[0]
+
+    def test_rejects_mismatched_driver(self, catalog):
+        errors, _ = catalog.check({'browserName': 'chrome', 'browserVersion': '99',
+                                   'platformName': 'Windows 10',
+                                   'sauce:options': {'chromedriverVersion': '98.0.4758.102'}})
+
+        assert errors == ['chromedriverVersion 98.0.4758.102 does not match chrome 99']
+
+    def test_validates_and_pins_options(self, catalog, monkeypatch):
+        monkeypatch.setenv('SAUCE_USERNAME', 'x')
+        monkeypatch.setenv('SAUCE_ACCESS_KEY', 'y')
+        options = SauceOptions.chrome(platformName='macOS 12')
+
+        catalog.validate(options)
+
+        assert options.browser_version == '100'
+
+    def test_raises_for_invalid_options(self, catalog, monkeypatch):
+        monkeypatch.setenv('SAUCE_USERNAME', 'x')
+        monkeypatch.setenv('SAUCE_ACCESS_KEY', 'y')
+
+        with pytest.raises(UnsupportedPlatformException) as error:
+            catalog.validate(SauceOptions.firefox(browserVersion='50'))
+
+        assert 'available versions: 98, 97' in str(error.value)
+        assert isinstance(error.value, InvalidPlatformException)
+
+
+class TestSnapshot(object):
+
+    def test_refreshes_from_api(self, api, tmp_path):
+        path = str(tmp_path / 'platforms.json')
+
+        catalog = PlatformCatalog.load(api, path)
+
+        assert api.server.requests == ['/rest/v1/info/platforms/webdriver']
+        assert catalog.versions('firefox', 'Windows 10') == ['98', '97']
+        assert PlatformCatalog.from_snapshot(path).platforms == platforms
+
+    def test_uses_fresh_snapshot_offline(self, api, tmp_path):
+        path = str(tmp_path / 'platforms.json')
+        PlatformCatalog(platforms, fetched=time.time()).save(path)
+
+        catalog = PlatformCatalog.load(api, path)
+
+        assert api.server.requests == []
+        assert catalog.latest('chrome', 'Windows 10') == '100'
+
+    def test_refreshes_stale_snapshot(self, api, tmp_path):
+        path = str(tmp_path / 'platforms.json')
+        PlatformCatalog([], fetched=time.time() - 10).save(path)
+
+        catalog = PlatformCatalog.load(api, path, max_age=5)
+
+        assert len(api.server.requests) == 1
+        assert catalog.latest('chrome', 'Windows 10') == '100'
+
+    def test_falls_back_to_stale_snapshot(self, tmp_path):
+        path = str(tmp_path / 'platforms.json')
+        PlatformCatalog(platforms, fetched=1).save(path)
+        unreachable = SauceApi('u', 'k', url='http://127.0.0.1:9', timeout=1)
+
+        assert PlatformCatalog.load(unreachable, path).latest('safari', 'macOS 12') == '15'
+
+    def test_requires_snapshot_without_api(self, tmp_path):
+        with pytest.raises(UnsupportedPlatformException):
+            PlatformCatalog.load(path=str(tmp_path / 'missing.json'))
+
+
+class TestSession(object):
+
+    def test_fails_fast_before_creating_driver(self, catalog, mocker):
+        sauce_session = SauceSession(SauceOptions.safari(platformName='Windows 10'),
+                                     catalog=catalog)
+        create_driver = mocker.patch.object(sauce_session, 'create_driver')
+
+        with pytest.raises(UnsupportedPlatformException):
+            sauce_session.start()
+
+        create_driver.assert_not_called()
+
+    def test_starts_with_pinned_version(self, catalog, mocker):
+        sauce_session = SauceSession(SauceOptions.chrome(), catalog=catalog)
+        create_driver = mocker.patch.object(sauce_session, 'create_driver')
+
+        sauce_session.start()
+
+        assert create_driver.call_args[0][1]['browserVersion'] == '100'
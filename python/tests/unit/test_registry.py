@@ -0,0 +1,146 @@
+import gc
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import saucebindings
+from saucebindings.registry import SessionRegistry, registry
+from saucebindings.session import SauceSession
+
+
+class Session(object):
+    pass
+
+
+def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return True
+        threading.Event().wait(0.01)
+    return False
+
+
+class TestRegistry(object):
+
+    def test_tracks_started_sessions(self, mocker):
+        tracker = SessionRegistry()
+        session = Session()
+        driver = mocker.MagicMock()
+
+        tracker.register(session, driver)
+        assert tracker.active == [driver]
+
+        tracker.unregister(session)
+        assert tracker.active == []
+
+    def test_quits_sessions_collected_while_running(self, mocker):
+        tracker = SessionRegistry()
+        driver = mocker.MagicMock()
+        tracker.register(Session(), driver)
+        gc.collect()
+
+        assert wait_for(lambda: driver.quit.called)
+        assert tracker.active == []
+
+    def test_ignores_stopped_sessions_when_collected(self, mocker):
+        tracker = SessionRegistry()
+        session = Session()
+        driver = mocker.MagicMock()
+        tracker.register(session, driver)
+        tracker.unregister(session)
+
+        del session
+        gc.collect()
+
+        driver.quit.assert_not_called()
+
+    def test_reaps_remaining_sessions(self, mocker):
+        tracker = SessionRegistry()
+        sessions = [Session() for _ in range(5)]
+        drivers = [mocker.MagicMock() for _ in sessions]
+        for session, driver in zip(sessions, drivers):
+            tracker.register(session, driver)
+
+        assert tracker.reap() == 5
+
+        for driver in drivers:
+            driver.quit.assert_called_once()
+        assert tracker.active == []
+
+    def test_reap_survives_quit_failures(self, mocker):
+        tracker = SessionRegistry()
+        session = Session()
+        driver = mocker.MagicMock()
+        driver.quit.side_effect = Exception
+        tracker.register(session, driver)
+
+        assert tracker.reap() == 1
+
+    def test_reaps_in_current_thread_when_threads_are_refused(self, mocker):
+        tracker = SessionRegistry()
+        sessions = [Session() for _ in range(3)]
+        drivers = [mocker.MagicMock() for _ in sessions]
+        for session, driver in zip(sessions, drivers):
+            tracker.register(session, driver)
+        mocker.patch('threading.Thread.start',
+                     side_effect=RuntimeError("can't create new thread at interpreter shutdown"))
+
+        assert tracker.reap() == 3
+
+        for driver in drivers:
+            driver.quit.assert_called_once()
+
+    def test_reaps_at_interpreter_exit(self, tmp_path):
+        marker = tmp_path / 'quit'
+        script = tmp_path / 'leak.py'
+        script.write_text(textwrap.dedent("""
+            import sys
+
+            from saucebindings.registry import registry
+
+
+            class Session(object):
+                pass
+
+
+            class Driver(object):
+                def quit(self):
+                    open(sys.argv[1], 'w').close()
+
+
+            session = Session()
+            registry.register(session, Driver())
+        """))
+        root = os.path.dirname(os.path.dirname(saucebindings.__file__))
+        env = dict(os.environ, PYTHONPATH=root)
+
+        result = subprocess.run([sys.executable, str(script), str(marker)], env=env,
+                                capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert 'Traceback' not in result.stderr
+        assert marker.exists()
+
+
+class TestSession(object):
+
+    def test_registers_until_stopped(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+
+        driver = session.start()
+        assert driver in registry.active
+
+        session.stop(True)
+        assert driver not in registry.active
+
+    def test_unregisters_on_pause(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+
+        driver = session.start()
+        session.pause()
+
+        assert driver not in registry.active
@@ -0,0 +1,102 @@
+import base64
+import os
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.screenshots import save_screenshot
+from saucebindings.session import SauceSession
+
+png = bytes(range(256)) * 1000
+
+
+class ScreenshotHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status, body = self.server.response
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(stub_server):
+    return stub_server(ScreenshotHandler,
+                       response=(200, b'{"value": "' + base64.b64encode(png) + b'"}'))
+
+
+@pytest.fixture
+def executor(server):
+    return RemoteConnection(server.url, keep_alive=True)
+
+
+class TestSaveScreenshot(object):
+
+    def test_streams_decoded_png_to_file(self, executor, tmp_path):
+        path = str(tmp_path / 'shot.png')
+
+        assert save_screenshot(executor, 'abc', path) == path
+
+        with open(path, 'rb') as f:
+            assert f.read() == png
+        assert not os.path.exists(path + '.part')
+
+    def test_handles_small_chunks_and_escaped_slashes(self, server, executor, tmp_path):
+        encoded = base64.b64encode(png).replace(b'/', b'\\/')
+        server.response = (200, b'{"sessionId":"abc","value":"' + encoded + b'"}')
+        path = str(tmp_path / 'shot.png')
+
+        save_screenshot(executor, 'abc', path, chunk_size=7)
+
+        with open(path, 'rb') as f:
+            assert f.read() == png
+
+    def test_raises_on_error_response(self, server, executor, tmp_path):
+        server.response = (404, b'{"value": {"error": "invalid session id"}}')
+        path = str(tmp_path / 'shot.png')
+
+        with pytest.raises(WebDriverException):
+            save_screenshot(executor, 'abc', path)
+
+        assert not os.path.exists(path)
+
+    def test_cleans_up_truncated_response(self, server, executor, tmp_path):
+        server.response = (200, b'{"value": "iVBORw0K')
+        path = str(tmp_path / 'shot.png')
+
+        with pytest.raises(WebDriverException):
+            save_screenshot(executor, 'abc', path)
+
+        assert not os.path.exists(path + '.part')
+
+
+class TestSession(object):
+
+    def test_requires_start(self, tmp_path):
+        session = SauceSession()
+        with pytest.raises(SessionNotStartedException):
+            session.save_screenshot(str(tmp_path / 'shot.png'))
+
+    def test_saves_in_background_and_stop_waits(self, mocker, executor, tmp_path):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+        driver = session.start()
+        driver.command_executor = executor
+        path = str(tmp_path / 'shot.png')
+
+        future = session.save_screenshot(path, background=True)
+        session.stop(True)
+
+        assert future.done()
+        assert future.result() == path
+        with open(path, 'rb') as f:
+            assert f.read() == png
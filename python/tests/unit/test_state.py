@@ -0,0 +1,229 @@
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+import saucebindings
+from saucebindings import plugin
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.session import SauceSession
+from saucebindings.state import (StateCache, capture_state_script, ensure_state,
+                                 restore_state_script)
+
+state = {'url': 'https://www.saucedemo.com/inventory.html',
+         'origin': 'https://www.saucedemo.com',
+         'localStorage': {'cart-contents': '[4]'}, 'sessionStorage': {},
+         'cookies': [{'name': 'session-username', 'value': 'standard_user', 'path': '/'},
+                     {'name': 'token', 'value': 'secret', 'httpOnly': True},
+                     {'name': 'expired', 'value': 'x', 'expiry': 1}]}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StateCache(str(tmp_path / 'state'))
+
+
+@pytest.fixture
+def session(mocker):
+    sauce_session = SauceSession()
+    mocker.patch.object(sauce_session, 'create_driver')
+    driver = sauce_session.start()
+    driver.current_url = 'data:,'
+    driver.execute_script.return_value = {key: value for key, value in state.items()
+                                          if key != 'cookies'}
+    driver.get_cookies.return_value = state['cookies']
+    return sauce_session
+
+
+class TestStateCache(object):
+
+    def test_round_trips_state(self, cache):
+        cache.put('standard_user', state)
+
+        saved = cache.get('standard_user')
+        assert saved['cookies'] == state['cookies']
+        assert saved['key'] == 'standard_user'
+
+    def test_restricts_permissions(self, cache):
+        cache.put('standard_user', state)
+
+        assert os.stat(cache.path('standard_user')).st_mode & 0o077 == 0
+
+    def test_defaults_to_user_cache_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+
+        cache = StateCache()
+
+        assert cache.directory == str(tmp_path / 'saucebindings' / 'state')
+        assert os.stat(cache.directory).st_mode & 0o077 == 0
+
+    def test_expires_after_ttl(self, cache):
+        cache.put('standard_user', state)
+        cache.ttl = -1
+
+        assert cache.get('standard_user') is None
+        assert not os.path.exists(cache.path('standard_user'))
+
+    def test_evicts_oldest_entries(self, cache):
+        cache.max_entries = 2
+        for number, key in enumerate(['a', 'b', 'c']):
+            cache.put(key, state)
+            os.utime(cache.path(key), (time.time() - 10 + number, time.time() - 10 + number))
+        cache.evict()
+
+        assert [cache.get(key) is not None for key in ['a', 'b', 'c']] == [False, True, True]
+
+    def test_ignores_corrupt_entries(self, cache):
+        with open(cache.path('broken'), 'w') as f:
+            f.write('{')
+
+        assert cache.get('broken') is None
+
+    def test_deletes_entries(self, cache):
+        cache.put('a', state)
+        cache.delete('a')
+
+        assert cache.get('a') is None
+
+
+class TestSession(object):
+
+    def test_requires_start(self, cache):
+        with pytest.raises(SessionNotStartedException):
+            SauceSession().save_state('a', cache)
+        with pytest.raises(SessionNotStartedException):
+            SauceSession().restore_state('a', cache)
+
+    def test_saves_state(self, session, cache):
+        session.save_state('standard_user', cache)
+
+        session.driver.execute_script.assert_called_once_with(capture_state_script)
+        assert cache.get('standard_user')['cookies'] == state['cookies']
+
+    def test_restores_state_in_bulk(self, session, cache):
+        cache.put('standard_user', state)
+
+        assert session.restore_state('standard_user', cache)
+
+        driver = session.driver
+        assert driver.get.call_args_list[0][0] == ('https://www.saucedemo.com',)
+        script, restored = driver.execute_script.call_args[0]
+        assert script == restore_state_script
+        assert restored['localStorage'] == {'cart-contents': '[4]'}
+        assert [cookie['name'] for cookie in restored['cookies']] == ['session-username']
+        driver.add_cookie.assert_called_once_with(state['cookies'][1])
+        assert driver.get.call_args[0] == (state['url'],)
+
+    def test_skips_navigation_on_same_origin(self, session, cache):
+        cache.put('standard_user', state)
+        session.driver.current_url = 'https://www.saucedemo.com/'
+
+        session.restore_state('standard_user', cache, url='https://www.saucedemo.com/cart.html')
+
+        session.driver.get.assert_called_once_with('https://www.saucedemo.com/cart.html')
+
+    def test_reports_missing_state(self, session, cache):
+        assert not session.restore_state('nobody', cache)
+        session.driver.get.assert_not_called()
+
+    def test_logs_in_once(self, session, cache, mocker):
+        login = mocker.MagicMock()
+
+        assert ensure_state(session, 'standard_user', login, cache)
+        assert not ensure_state(session, 'standard_user', login, cache)
+
+        login.assert_called_once_with(session)
+
+    def test_waits_for_concurrent_login(self, session, cache, mocker):
+        login = mocker.MagicMock()
+
+        with cache.lock('standard_user'):
+            worker = threading.Thread(target=ensure_state,
+                                      args=(session, 'standard_user', login, cache))
+            worker.start()
+            time.sleep(0.2)
+            cache.put('standard_user', state)
+        worker.join()
+
+        login.assert_not_called()
+        assert not os.path.exists(cache.path('standard_user', '.lock'))
+
+    def test_breaks_stale_locks(self, cache):
+        path = cache.path('standard_user', '.lock')
+        open(path, 'w').close()
+        os.utime(path, (1, 1))
+
+        with cache.lock('standard_user', timeout=60):
+            assert os.path.exists(path)
+        assert not os.path.exists(path)
+
+
+class TestPlugin(object):
+
+    def test_fixtures(self, tmp_path):
+        (tmp_path / 'conftest.py').write_text(textwrap.dedent("""
+            from unittest import mock
+
+            import pytest
+
+            from saucebindings.session import SauceSession
+
+            pytest_plugins = ['saucebindings.plugin']
+
+
+            @pytest.fixture(autouse=True)
+            def driver(monkeypatch):
+                driver = mock.MagicMock(current_url='data:,', session_id='abc')
+                driver.execute_script.return_value = {
+                    'url': 'https://a.com/', 'origin': 'https://a.com',
+                    'localStorage': {}, 'sessionStorage': {}}
+                driver.get_cookies.return_value = []
+                monkeypatch.setattr(SauceSession, 'create_driver', lambda *args: driver)
+                return driver
+        """))
+        (tmp_path / 'pytest.ini').write_text(
+            "[pytest]\nsauce_state_dir = state\nsauce_warm_up = false\n")
+        (tmp_path / 'test_login.py').write_text(textwrap.dedent("""
+            logins = []
+
+
+            def test_first(sauce_login, sauce_session):
+                assert sauce_login('user', logins.append)
+
+
+            def test_second(sauce_login, sauce_session, driver):
+                assert not sauce_login('user', logins.append)
+                assert len(logins) == 1
+                assert sauce_session.options.name == 'test_second'
+        """))
+        root = os.path.dirname(os.path.dirname(saucebindings.__file__))
+        env = dict(os.environ, SAUCE_USERNAME='x', SAUCE_ACCESS_KEY='y', PYTHONPATH=root)
+
+        result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider',
+                                 str(tmp_path)], cwd=str(tmp_path), env=env,
+                                capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert os.listdir(str(tmp_path / 'state'))
+
+    def test_warms_up_connections(self, mocker):
+        warm_up = mocker.patch('saucebindings.plugin.network.warm_up')
+        config = mocker.MagicMock()
+        config.getini.side_effect = {'sauce_warm_up': True, 'sauce_data_center': 'eu-central'}.get
+
+        plugin.pytest_configure(config)
+
+        warm_up.assert_called_once_with('eu-central')
+
+    def test_warm_up_is_optional(self, mocker):
+        warm_up = mocker.patch('saucebindings.plugin.network.warm_up')
+        config = mocker.MagicMock()
+        config.getini.side_effect = {'sauce_warm_up': False}.get
+
+        plugin.pytest_configure(config)
+
+        warm_up.assert_not_called()
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from saucebindings.accessibility import fingerprint
+from saucebindings.store import AccessibilityStore
+
+
+def results(url, *violations):
+    return {'url': url,
+            'violations': [{'id': rule, 'impact': 'serious',
+                            'nodes': [{'target': [target], 'html': '<div></div>'}]}
+                           for rule, target in violations]}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'a11y.db')
+
+
+class TestAdd(object):
+
+    def test_fingerprints_violations(self, path):
+        with AccessibilityStore(path, 'build-1') as store:
+            store.add(results('https://a.com/', ('label', '#name')))
+
+            violation, = store.violations()
+
+        assert violation.fingerprint == fingerprint('label', ['#name'], 'https://a.com/')
+        assert violation.rule == 'label'
+        assert violation.impact == 'serious'
+        assert json.loads(violation.target) == ['#name']
+        assert violation.count == 1
+
+    def test_deduplicates_repeated_violations(self, path):
+        with AccessibilityStore(path, 'build-1') as store:
+            store.add_all([results('https://a.com/', ('label', '#name')),
+                           results('https://a.com/', ('label', '#name'))])
+
+            violation, = store.violations()
+
+        assert violation.count == 2
+
+    def test_keeps_same_violation_on_different_pages(self, path):
+        with AccessibilityStore(path, 'build-1') as store:
+            store.add(results('https://a.com/', ('label', '#name')))
+            store.add(results('https://a.com/other', ('label', '#name')))
+
+            assert len(store.violations()) == 2
+
+    def test_loads_results_from_json_lines(self, path, tmp_path):
+        scans = tmp_path / 'scans.jsonl'
+        lines = (results('https://a.com/{}'.format(i), ('label', '#x')) for i in range(3))
+        scans.write_text("\n".join(json.dumps(line) for line in lines))
+
+        with AccessibilityStore(path, 'build-1') as store:
+            store.load(str(scans))
+
+            assert len(store.violations()) == 3
+
+
+class TestDiff(object):
+
+    def test_reports_new_and_fixed_violations(self, path):
+        with AccessibilityStore(path, 'baseline') as store:
+            store.add(results('https://a.com/', ('label', '#name'), ('region', 'main')))
+
+        with AccessibilityStore(path, 'build-2') as store:
+            store.add(results('https://a.com/', ('label', '#name'), ('image-alt', 'img')))
+
+            assert [v.rule for v in store.new_violations('baseline')] == ['image-alt']
+            assert [v.rule for v in store.fixed_violations('baseline')] == ['region']
+            assert store.builds() == ['baseline', 'build-2']
+
+    def test_everything_is_new_without_baseline(self, path):
+        with AccessibilityStore(path, 'build-1') as store:
+            store.add(results('https://a.com/', ('label', '#name')))
+
+            assert len(store.new_violations('missing')) == 1
@@ -0,0 +1,127 @@
+import pytest
+
+from saucebindings.exceptions import InvalidPlatformException, SessionNotStartedException
+from saucebindings.options import SauceOptions
+from saucebindings.session import SauceSession
+from saucebindings.sweep import ProfileSweep
+from saucebindings.throttling import network_condition
+
+
+def chrome():
+    options = SauceOptions.chrome()
+    options.extended_debugging = True
+    return options
+
+
+class TestNetworkCondition(object):
+
+    def test_accepts_named_profile(self):
+        assert network_condition('Regular 3G') == 'Regular 3G'
+
+    def test_rejects_unknown_profile(self):
+        with pytest.raises(ValueError):
+            network_condition('5G')
+
+    def test_builds_custom_condition(self):
+        assert network_condition(download=1000, latency=300) == {'download': 1000, 'latency': 300}
+
+    def test_accepts_custom_condition_as_dict(self):
+        assert network_condition({'upload': 500}) == {'upload': 500}
+
+    def test_rejects_empty_condition(self):
+        with pytest.raises(ValueError):
+            network_condition()
+
+    def test_rejects_negative_values(self):
+        with pytest.raises(ValueError):
+            network_condition(latency=-1)
+
+
+class TestSession(object):
+
+    def test_requires_start(self):
+        with pytest.raises(SessionNotStartedException):
+            SauceSession(chrome()).throttle_network('GPRS')
+
+    def test_requires_extended_debugging(self, mocker):
+        sauce_session = SauceSession(SauceOptions.chrome())
+        mocker.patch.object(sauce_session, 'create_driver')
+        sauce_session.start()
+
+        with pytest.raises(InvalidPlatformException):
+            sauce_session.throttle_network('GPRS')
+
+    def test_requires_chrome(self, mocker):
+        sauce_session = SauceSession(SauceOptions.firefox())
+        mocker.patch.object(sauce_session, 'create_driver')
+        sauce_session.start()
+
+        with pytest.raises(InvalidPlatformException):
+            sauce_session.throttle_network('GPRS')
+
+    def test_throttles_network(self, mocker):
+        sauce_session = SauceSession(chrome())
+        mocker.patch.object(sauce_session, 'create_driver')
+        driver = sauce_session.start()
+
+        sauce_session.throttle_network(download=1000, upload=500, latency=40)
+
+        driver.execute_script.assert_called_once_with(
+            "sauce:throttleNetwork", {'download': 1000, 'upload': 500, 'latency': 40})
+
+    def test_resets_network(self, mocker):
+        sauce_session = SauceSession(chrome())
+        mocker.patch.object(sauce_session, 'create_driver')
+        driver = sauce_session.start()
+
+        sauce_session.reset_network()
+
+        driver.execute_script.assert_called_once_with("sauce:throttleNetwork", 'online')
+
+
+class TestProfileSweep(object):
+
+    @pytest.fixture
+    def sessions(self, mocker):
+        started = []
+
+        def create(options, data_center):
+            session = mocker.MagicMock()
+            started.append(session)
+            return session
+
+        mocker.patch('saucebindings.sweep.SauceSession', side_effect=create)
+        return started
+
+    def test_runs_scenario_per_profile(self, sessions):
+        profiles = ['Regular 3G', {'latency': 300}]
+
+        results = ProfileSweep(lambda session: 'done', profiles).run()
+
+        assert [result.profile for result in results] == profiles
+        assert all(result.value == 'done' and result.duration >= 0 for result in results)
+        throttled = [session.throttle_network.call_args[0][0] for session in sessions]
+        assert sorted(throttled, key=str) == sorted(profiles, key=str)
+        for session in sessions:
+            session.stop.assert_called_once_with(True)
+
+    def test_collects_errors(self, sessions):
+        def scenario(session):
+            raise RuntimeError('boom')
+
+        result, = ProfileSweep(scenario, ['GPRS']).run()
+
+        assert isinstance(result.error, RuntimeError)
+        sessions[0].stop.assert_called_once_with(False)
+
+    def test_validates_profiles_up_front(self):
+        with pytest.raises(ValueError):
+            ProfileSweep(lambda session: None, ['5G'])
+
+    def test_reports_side_by_side(self, sessions):
+        results = ProfileSweep(lambda session: None, ['GPRS', {'latency': 300}]).run()
+
+        report = ProfileSweep.report(results).splitlines()
+
+        assert report[1].startswith('GPRS')
+        assert report[2].startswith('latency=300')
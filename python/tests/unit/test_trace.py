@@ -0,0 +1,166 @@
+import json
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+from saucebindings.session import SauceSession
+from saucebindings.trace import (TraceRecorder, TraceReplayer, batchable_sequences, element_key,
+                                 read_trace, trace_report)
+
+
+@pytest.fixture
+def driver(mocker):
+    driver = mocker.MagicMock()
+    driver.session_id = 'recorded-session'
+
+    def execute(command, params=None):
+        if command == Command.FIND_ELEMENT:
+            return {'value': WebElement(driver, 'recorded-element')}
+        if command == Command.SCREENSHOT:
+            return {'value': 'A' * 10000}
+        if command == Command.CLEAR_ELEMENT:
+            raise NoSuchElementException('gone')
+        return {'value': 'text'}
+
+    driver.execute.side_effect = execute
+    return driver
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'trace.jsonl')
+
+
+def record(driver, path):
+    recorder = TraceRecorder(path, driver, capabilities={'browserName': 'chrome'}).start()
+    driver.execute(Command.GET, {'url': 'https://a.com', 'sessionId': 'recorded-session'})
+    driver.execute(Command.FIND_ELEMENT, {'using': 'css selector', 'value': '#a'})
+    driver.execute(Command.GET_ELEMENT_TEXT, {'id': 'recorded-element'})
+    driver.execute(Command.GET_ELEMENT_ATTRIBUTE, {'id': 'recorded-element', 'name': 'href'})
+    driver.execute(Command.W3C_EXECUTE_SCRIPT,
+                   {'script': 'return 1', 'args': [WebElement(driver, 'recorded-element')]})
+    with pytest.raises(NoSuchElementException):
+        driver.execute(Command.CLEAR_ELEMENT, {'id': 'recorded-element'})
+    recorder.stop()
+    return recorder
+
+
+class TestTraceRecorder(object):
+
+    def test_writes_compact_entries(self, driver, path):
+        recorder = record(driver, path)
+
+        entries = list(read_trace(path))
+        assert entries[0] == {'capabilities': {'browserName': 'chrome'}}
+        assert [entry['c'] for entry in entries[1:]] == [
+            Command.GET, Command.FIND_ELEMENT, Command.GET_ELEMENT_TEXT,
+            Command.GET_ELEMENT_ATTRIBUTE, Command.W3C_EXECUTE_SCRIPT, Command.CLEAR_ELEMENT]
+        assert entries[1]['p'] == {'url': 'https://a.com'}
+        assert entries[2]['v'] == {element_key: 'recorded-element'}
+        assert entries[5]['p']['args'] == [{element_key: 'recorded-element'}]
+        assert entries[6]['e'] == 'NoSuchElementException'
+        assert all(entry['d'] >= 0 for entry in entries[1:])
+        assert recorder.commands == 7
+
+    def test_drops_large_values(self, driver, path):
+        recorder = TraceRecorder(path, driver).start()
+        driver.execute(Command.SCREENSHOT)
+        recorder.stop()
+
+        entry, = read_trace(path)
+        assert entry['v'] is None
+
+    def test_stops_recording(self, driver, path):
+        TraceRecorder(path, driver).start().stop()
+        driver.execute(Command.GET, {'url': 'https://a.com'})
+
+        assert list(read_trace(path)) == []
+
+    @pytest.mark.benchmark
+    def test_recording_is_cheap(self, driver, path):
+        recorder = TraceRecorder(path, driver)
+        params = {'id': 'recorded-element', 'name': 'href'}
+        response = {'value': 'https://a.com/about'}
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            recorder.after_command(Command.GET_ELEMENT_ATTRIBUTE, params, response, 0.05)
+        elapsed = time.perf_counter() - start
+        recorder.stop()
+
+        # Under 5% of even a fast 10ms remote command
+        assert elapsed / 1000 < 0.0005
+
+
+class TestTraceReplayer(object):
+
+    def test_replays_with_remapped_ids(self, driver, path, mocker):
+        record(driver, path)
+        target = mocker.MagicMock()
+        target.execute.side_effect = lambda command, params=None: {
+            'value': {element_key: 'replayed-element'}} \
+            if command == Command.FIND_ELEMENT else {'value': None}
+
+        result = TraceReplayer(target).replay(path)
+
+        assert result.commands == 6
+        assert result.errors == []
+        calls = target.execute.call_args_list
+        assert calls[2][0] == (Command.GET_ELEMENT_TEXT, {'id': 'replayed-element'})
+        assert calls[4][0][1]['args'] == [{element_key: 'replayed-element'}]
+        assert calls[5][0] == (Command.CLEAR_ELEMENT, {'id': 'replayed-element'})
+
+    def test_collects_errors(self, driver, path, mocker):
+        record(driver, path)
+        target = mocker.MagicMock()
+        target.execute.side_effect = NoSuchElementException('missing')
+
+        result = TraceReplayer(target).replay(path)
+
+        assert len(result.errors) == 6
+
+
+class TestReport(object):
+
+    def test_finds_batchable_sequences(self, driver, path):
+        record(driver, path)
+
+        sequence, = batchable_sequences(read_trace(path))
+
+        assert sequence.start == 1
+        assert sequence.commands == [Command.FIND_ELEMENT, Command.GET_ELEMENT_TEXT,
+                                     Command.GET_ELEMENT_ATTRIBUTE, Command.W3C_EXECUTE_SCRIPT]
+
+    def test_summarizes_trace(self, driver, path):
+        record(driver, path)
+
+        report = trace_report(path)
+
+        assert report['commands'] == 6
+        assert report['errors'] == 1
+        assert report['batchable_commands'] == 4
+        assert report['by_command'][Command.GET] == 1
+
+
+class TestSession(object):
+
+    def test_records_without_credentials(self, mocker, path):
+        sauce_session = SauceSession()
+        mocker.patch.object(sauce_session, 'create_driver')
+        driver = sauce_session.start()
+        driver.session_id = 'abc'
+
+        sauce_session.record_trace(path)
+        driver.execute(Command.GET, {'url': 'https://a.com'})
+        sauce_session.stop(True)
+
+        with open(path) as f:
+            header = json.loads(f.readline())
+            entry = json.loads(f.readline())
+        assert 'accessKey' not in header['capabilities']['sauce:options']
+        assert entry['c'] == Command.GET
+        assert sauce_session.trace is None
+        assert 'accessKey' in sauce_session.options.to_capabilities()['sauce:options']
@@ -0,0 +1,130 @@
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.session import SauceSession
+from saucebindings.waits import wait_for, wait_for_element_script, wait_until, wait_until_script
+
+
+@pytest.fixture
+def driver(mocker):
+    driver = mocker.MagicMock()
+    driver.execute_async_script.return_value = {'value': 'element'}
+    driver.caps = {}
+    return driver
+
+
+class TestWaitFor(object):
+
+    def test_waits_in_one_call(self, driver):
+        assert wait_for(driver, (By.ID, 'login'), 'visible', timeout=5) == 'element'
+
+        driver.execute_async_script.assert_called_once_with(
+            wait_for_element_script, {'using': 'css selector', 'value': '[id="login"]'},
+            'visible', None, 5000)
+
+    def test_waits_for_visible_by_default(self, driver):
+        wait_for(driver, (By.ID, 'a'))
+
+        assert driver.execute_async_script.call_args[0][2] == 'visible'
+
+    def test_keeps_longer_script_timeout(self, driver):
+        wait_for(driver, (By.ID, 'a'), timeout=5)
+
+        driver.set_script_timeout.assert_not_called()
+
+    def test_waits_in_one_round_trip(self, mocker):
+        driver = webdriver.Remote.__new__(webdriver.Remote)
+        driver.session_id = 'abc'
+        driver.caps = {}
+        driver.error_handler = ErrorHandler()
+        driver.command_executor = mocker.MagicMock()
+        driver.command_executor.execute.return_value = {'value': {'value': 'element'}}
+
+        assert wait_for(driver, (By.ID, 'a')) == 'element'
+
+        assert driver.command_executor.execute.call_count == 1
+
+    def test_follows_script_timeout_set_on_driver(self, driver):
+        driver.caps = {'timeouts': {'script': 60000}}
+        wait_for(driver, (By.ID, 'a'), timeout=5)
+        driver.execute(Command.SET_TIMEOUTS, {'script': 2000})
+
+        wait_for(driver, (By.ID, 'a'), timeout=5)
+
+        assert [call[0][0] for call in driver.set_script_timeout.call_args_list] == [6, 2]
+
+    def test_restores_script_timeout(self, driver):
+        driver.caps = {'timeouts': {'script': 2000}}
+
+        wait_for(driver, (By.ID, 'a'), timeout=5)
+
+        assert [call[0][0] for call in driver.set_script_timeout.call_args_list] == [6, 2]
+
+    def test_raises_timeout(self, driver):
+        driver.execute_async_script.return_value = {'timeout': True}
+
+        with pytest.raises(TimeoutException) as error:
+            wait_for(driver, (By.ID, 'a'), 'text', timeout=1, text='Done')
+
+        assert "to contain 'Done'" in str(error.value)
+
+    def test_raises_timeout_when_driver_times_out_first(self, driver):
+        driver.execute_async_script.side_effect = TimeoutException('script timeout')
+        driver.caps = {'timeouts': {'script': 0}}
+
+        with pytest.raises(TimeoutException):
+            wait_for(driver, (By.ID, 'a'), timeout=1)
+
+        assert [call[0][0] for call in driver.set_script_timeout.call_args_list] == [2, 0]
+
+    def test_rejects_invalid_condition(self, driver):
+        with pytest.raises(ValueError):
+            wait_for(driver, (By.ID, 'a'), 'clickable')
+
+    def test_text_condition_requires_text(self, driver):
+        with pytest.raises(ValueError):
+            wait_for(driver, (By.ID, 'a'), 'text')
+
+
+class TestWaitUntil(object):
+
+    def test_waits_for_script(self, driver):
+        driver.execute_async_script.return_value = {'value': True}
+
+        assert wait_until(driver, 'return document.title === arguments[0]', 'Swag Labs',
+                          timeout=3) is True
+
+        driver.execute_async_script.assert_called_once_with(
+            wait_until_script, 'return document.title === arguments[0]', ['Swag Labs'], 3000)
+
+    def test_raises_script_errors(self, driver):
+        driver.execute_async_script.return_value = {'error': 'boom is not defined'}
+
+        with pytest.raises(TimeoutException) as error:
+            wait_until(driver, 'return boom')
+
+        assert 'boom is not defined' in str(error.value)
+
+
+class TestSession(object):
+
+    def test_requires_start(self):
+        with pytest.raises(SessionNotStartedException):
+            SauceSession().wait_for((By.ID, 'a'))
+        with pytest.raises(SessionNotStartedException):
+            SauceSession().wait_until('return true')
+
+    def test_waits_for_visible_element(self, mocker):
+        sauce_session = SauceSession()
+        mocker.patch.object(sauce_session, 'create_driver')
+        driver = sauce_session.start()
+        driver.execute_async_script.return_value = {'value': 'element'}
+        driver.caps = {}
+
+        assert sauce_session.wait_for((By.ID, 'a')) == 'element'
+        assert driver.execute_async_script.call_args[0][2] == 'visible'
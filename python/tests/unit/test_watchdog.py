@@ -0,0 +1,127 @@
+import time
+
+import pytest
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from urllib3.exceptions import ReadTimeoutError
+
+from saucebindings.exceptions import SessionNotStartedException
+from saucebindings.session import SauceSession
+from saucebindings.watchdog import Watchdog
+
+
+def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestWatchdog(object):
+
+    def test_sets_client_socket_timeout(self, mocker):
+        driver = mocker.MagicMock()
+        executor = driver.command_executor = RemoteConnection('http://127.0.0.1:4444')
+
+        Watchdog(driver, command_timeout=5).start()
+
+        assert executor._timeout == 5
+        assert executor.keep_alive
+        assert executor._conn.connection_pool_kw['retries'] is False
+
+    def test_restores_client_connection(self, mocker):
+        driver = mocker.MagicMock()
+        executor = driver.command_executor = RemoteConnection('http://127.0.0.1:4444',
+                                                              keep_alive=True)
+        previous = executor._conn
+        watchdog = Watchdog(driver, command_timeout=5).start()
+
+        watchdog.stop()
+
+        assert executor._conn is previous
+        assert executor._timeout == RemoteConnection._timeout
+        assert '_timeout' not in vars(executor)
+
+    def test_trips_on_hung_command(self, mocker):
+        driver = mocker.MagicMock()
+        driver.session_id = 'abc'
+        driver.execute.side_effect = ReadTimeoutError(None, '/session', 'timed out')
+        api = mocker.MagicMock()
+        watchdog = Watchdog(driver, command_timeout=5, api=api).start()
+
+        with pytest.raises(ReadTimeoutError):
+            driver.execute(Command.GET_TITLE)
+
+        assert watchdog.tripped
+        assert 'getTitle' in watchdog.reason
+        assert wait_for(lambda: api.stop_job.called)
+        api.update_job.assert_called_once_with('abc', passed=False,
+                                               **{'custom-data': {'watchdog': watchdog.reason}})
+        api.stop_job.assert_called_once_with('abc')
+
+    def test_trips_on_total_deadline(self, mocker):
+        driver = mocker.MagicMock()
+        watchdog = Watchdog(driver, max_duration=0.05, check_interval=0.01).start()
+
+        assert wait_for(lambda: watchdog.tripped)
+        assert wait_for(lambda: driver.quit.called)
+
+    def test_trips_once(self, mocker):
+        driver = mocker.MagicMock()
+        watchdog = Watchdog(driver)
+
+        watchdog.trip('first')
+        watchdog.trip('second')
+
+        assert watchdog.reason == 'first'
+
+    def test_suggests_command_timeout_from_latencies(self, mocker):
+        watchdog = Watchdog(mocker.MagicMock())
+        assert watchdog.suggested_command_timeout() is None
+
+        watchdog.latencies.extend([0.1] * 98 + [2.0, 30.0])
+
+        assert watchdog.suggested_command_timeout() == 4
+        assert watchdog.suggested_command_timeout(percentile=100) == 60
+
+    def test_records_latencies(self, mocker):
+        driver = mocker.MagicMock()
+        watchdog = Watchdog(driver).start()
+
+        driver.execute(Command.GET_TITLE)
+
+        assert len(watchdog.latencies) == 1
+
+
+class TestSession(object):
+
+    def test_watchdog_requires_start(self):
+        session = SauceSession()
+        with pytest.raises(SessionNotStartedException):
+            session.start_watchdog()
+
+    def test_defaults_to_sauce_timeouts(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+        session.start()
+
+        watchdog = session.start_watchdog(api=mocker.MagicMock())
+
+        assert watchdog.max_duration == 1800
+        assert watchdog.command_timeout == 300
+        session.stop(True)
+        assert session.watchdog is None
+
+    def test_stop_skips_tripped_session(self, mocker):
+        session = SauceSession()
+        mocker.patch.object(session, 'create_driver')
+        driver = session.start()
+        watchdog = session.start_watchdog(api=mocker.MagicMock())
+        watchdog.reason = 'hung'
+        driver.reset_mock()
+
+        session.stop(True)
+
+        driver.execute_script.assert_not_called()
+        assert session.driver is None